@@ -1,17 +1,28 @@
 from flask import Flask
 from .config import Config
-from .db import init_db
-from .routes.api import api_bp
-from .routes.dashboard import dash_bp
 
 
-def create_app():
+# Blueprints and the database layer are imported inside the factories, so
+# importing the package (as celery beat and workers do) stays cheap.
+def create_app(**config):
+    from . import metrics, profiling
+    from .db import db, init_db
+    from .routes.api import api_bp
+    from .routes.dashboard import dash_bp
+    from .routes.export import export_bp
+
     app = Flask(__name__)
     app.config.from_object(Config)
+    app.config.update(config)
 
     init_db(app)
+    metrics.init_app(app)
+    with app.app_context():
+        for engine in db.engines.values():
+            profiling.instrument_engine(engine)
 
     app.register_blueprint(api_bp, url_prefix="/api")
+    app.register_blueprint(export_bp, url_prefix="/api/export")
     app.register_blueprint(dash_bp)
 
     @app.get("/health")
@@ -20,3 +31,18 @@ def create_app():
 
     return app
 
+
+
+def create_events_app():
+    from .routes.events import events_bp
+
+    app = Flask(__name__)
+    app.config.from_object(Config)
+
+    app.register_blueprint(events_bp, url_prefix="/api")
+
+    @app.get("/health")
+    def health():
+        return {"status": "ok"}
+
+    return app
@@ -0,0 +1,197 @@
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+import threading
+import time
+from datetime import datetime
+from app import create_app
+from app import ml
+from app.db import db
+from app.segments import parse_segments
+from app.synthetic_catalog import load_catalog
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE / 1024 / 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class PeakRSS:
+    # ru_maxrss only ever grows, so each phase samples its own peak.
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak_mb = max(self.peak_mb, current_rss_mb())
+
+    def __enter__(self):
+        self.start_mb = self.peak_mb = current_rss_mb()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_mb = max(self.peak_mb, current_rss_mb())
+
+
+def measure(phase, size, fn, repeat=1):
+    runs = []
+    with PeakRSS() as rss:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            value = fn()
+            runs.append(time.perf_counter() - start)
+
+    seconds = statistics.median(runs)
+    result = {
+        "size": size,
+        "phase": phase,
+        "seconds": round(seconds, 4),
+        "runs": [round(r, 4) for r in runs],
+        "peak_rss_mb": round(rss.peak_mb, 1),
+        "rss_growth_mb": round(rss.peak_mb - rss.start_mb, 1),
+    }
+    print(f"   {phase:30} {seconds:9.3f}s  pico {rss.peak_mb:7.1f}MB")
+    return result, value
+
+
+def bench_size(size, seed, repeat, segments, processes):
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+
+    results = []
+    r, _ = measure("seed_catalog", size, lambda: load_catalog(size, seed))
+    results.append(r)
+
+    r, movies_df = measure("get_catalog", size, ml.get_catalog, repeat=repeat)
+    r["rows"] = len(movies_df)
+    results.append(r)
+
+    r, features_df = measure("featurize_catalog", size, lambda: ml.featurize_catalog(movies_df), repeat=repeat)
+    results.append(r)
+
+    # Fit and persistence of each model on the largest configured segment.
+    segment = max(segments, key=lambda s: ml.segment_mask(movies_df, s).sum())
+    segment_df = features_df[ml.segment_mask(movies_df, segment)].reset_index(drop=True)
+    del movies_df, features_df
+    for model in ml.MODELS:
+        r, fitted = measure(f"fit_{model}", size, lambda: ml.FITTERS[model](segment_df), repeat=repeat)
+        r["segment"], r["rows"] = segment, len(segment_df)
+        results.append(r)
+        r, _ = measure(
+            f"persist_{model}", size,
+            lambda: ml.PERSISTERS[model](segment, fitted, datetime.utcnow()), repeat=repeat
+        )
+        results.append(r)
+    del segment_df
+
+    # End to end over every segment: one process versus the pool.
+    for phase, n in (("train_segments_serial", 1), ("train_segments", processes)):
+        r, out = measure(phase, size, lambda: ml.train_segments(segments, processes=n), repeat=repeat)
+        r["segments"], r["processes"] = len(segments), n
+        r["trained"] = sum(bool(m.get("trained")) for models in out.values() for m in models.values())
+        results.append(r)
+        db.session.expunge_all()
+
+    return results
+
+
+def compare(results, baseline_path, tolerance, min_seconds=0.05):
+    with open(baseline_path) as f:
+        baseline = {(r["size"], r["phase"]): r for r in json.load(f)["results"]}
+
+    regressions = []
+    print(f"\n🔎 Comparação com {baseline_path} (tolerância {tolerance:.0%})")
+    for r in results:
+        base = baseline.get((r["size"], r["phase"]))
+        if base is None:
+            continue
+        for metric in ("seconds", "peak_rss_mb"):
+            old, new = base[metric], r[metric]
+            if metric == "seconds" and max(old, new) < min_seconds:
+                continue
+            ratio = new / old if old else float("inf")
+            flag = ratio > 1 + tolerance
+            if flag:
+                regressions.append({"size": r["size"], "phase": r["phase"], "metric": metric, "old": old, "new": new})
+            print(f"   {'❌' if flag else 'ok'} {r['size']:>8} {r['phase']:30} {metric:12} {old:>10} → {new:<10} x{ratio:.2f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the segment ML pipeline on synthetic catalogs and store the timings as JSON."
+    )
+    parser.add_argument("--database-url", required=True, help="Throwaway database; all tables are dropped per size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="e.g. 1000 10000 100000 1000000")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per phase; the median is reported")
+    parser.add_argument("--segments", default="horror,thriller,drama,comedy,action,science-fiction",
+                        help="Comma separated segments for the end-to-end training phases")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="Pool size for train_segments")
+    parser.add_argument("--output", default=f"bench_ml_{datetime.utcnow():%Y%m%dT%H%M%S}.json")
+    parser.add_argument("--baseline", help="Previous result file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown/growth before failing")
+    args = parser.parse_args()
+
+    segments = parse_segments(args.segments)
+    # No replica bind: get_catalog would otherwise time reads against it.
+    app = create_app(SQLALCHEMY_DATABASE_URI=args.database_url, SQLALCHEMY_BINDS={})
+    results = []
+    with app.app_context():
+        dialect = db.engine.dialect.name
+        for size in args.sizes:
+            print(f"\n📦 Catálogo com {size} filmes")
+            results.extend(bench_size(size, args.seed, args.repeat, segments, args.processes))
+        db.session.remove()
+        db.drop_all()
+
+    import pandas
+    import sklearn
+    report = {
+        "meta": {
+            "ts": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "pandas": pandas.__version__,
+            "sklearn": sklearn.__version__,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "dialect": dialect,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "segments": segments,
+            "processes": args.processes,
+            "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Resultados em {args.output}")
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        if regressions:
+            print(f"❌ {len(regressions)} regressões acima de {args.tolerance:.0%}")
+            sys.exit(1)
+        print("✅ Sem regressões")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import json
+import time
+from sqlalchemy import event, text
+from sqlalchemy.pool import Pool
+from app import create_app
+from app.db import db
+from app.celery_app import make_flask_app
+
+
+def _task_body():
+    db.session.execute(text("SELECT 1"))
+    db.session.commit()
+
+
+_connects = [0]
+
+
+@event.listens_for(Pool, "connect")
+def _count_connect(*args):
+    _connects[0] += 1
+
+
+def bench_per_task_app(iterations):
+    _connects[0] = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        app = create_app()
+        with app.app_context():
+            _task_body()
+            db.engine.dispose()
+    elapsed = time.perf_counter() - start
+    return elapsed, _connects[0]
+
+
+def bench_shared_app(iterations):
+    app = make_flask_app()
+    _connects[0] = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        with app.app_context():
+            _task_body()
+    elapsed = time.perf_counter() - start
+    return elapsed, _connects[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare per-task overhead of building a Flask app per task vs. one app per worker process."
+    )
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    before, before_connects = bench_per_task_app(args.iterations)
+    after, after_connects = bench_shared_app(args.iterations)
+
+    print(json.dumps({
+        "iterations": args.iterations,
+        "per_task_app_ms": round(before / args.iterations * 1000, 3),
+        "per_task_app_new_connections": before_connects,
+        "shared_app_ms": round(after / args.iterations * 1000, 3),
+        "shared_app_new_connections": after_connects,
+        "speedup": round(before / after, 1) if after else None,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
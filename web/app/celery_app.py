@@ -1,12 +1,19 @@
 import os
+import logging
+import threading
+import time
 from celery import Celery
-from datetime import datetime
+from celery.signals import (
+    before_task_publish, task_prerun, task_postrun, worker_process_init, worker_process_shutdown
+)
 from .config import Config
-from .db import db
-from .models import ModelPrediction
-from .tmdb import initial_ingest_movies, update_movies_incremental, collect_movies_by_year_range
-from .ml import train_all_horror_models
-from flask import Flask
+from . import metrics
+from .events import publish_analysis, redis_client
+from .profiling import profiled_task
+from .task_locks import singleton_task
+from .task_slo import ENQUEUED_HEADER, record_latency
+
+logger = logging.getLogger(__name__)
 
 redis_url = os.getenv("REDIS_URL")
 celery = Celery(__name__, broker=redis_url, backend=redis_url)
@@ -16,6 +23,15 @@ celery.conf.update(
     broker_use_ssl={'ssl_cert_reqs': 'none'} if redis_url and redis_url.startswith('rediss://') else None,
     redis_backend_use_ssl={'ssl_cert_reqs': 'none'} if redis_url and redis_url.startswith('rediss://') else None,
     imports=('app.celery_app',),
+    # Each queue has its own worker service (see docker-compose.yml), so a
+    # long ingest or training run never delays the 5-minute update.
+    task_default_queue='update-io',
+    task_routes={
+        'app.celery_app.task_initial_ingest': {'queue': 'ingest-io'},
+        'app.celery_app.task_ingest': {'queue': 'ingest-io'},
+        'app.celery_app.task_update_movies': {'queue': 'update-io'},
+        'app.celery_app.task_train': {'queue': 'train-cpu'},
+    },
 )
 
 celery.conf.beat_schedule = {
@@ -30,15 +46,93 @@ celery.conf.beat_schedule = {
 }
 
 
+_flask_app = None
+_flask_app_lock = threading.Lock()
+
+
+def worker_engine_options():
+    options = dict(Config.SQLALCHEMY_ENGINE_OPTIONS)
+    options["pool_size"] = Config.CELERY_DB_POOL_SIZE
+    options["max_overflow"] = Config.CELERY_DB_MAX_OVERFLOW
+    return options
+
+
 def make_flask_app():
-    from . import create_app
-    return create_app()
+    global _flask_app
+    # The I/O queues run a threads pool, where worker_process_init never fires
+    # and the first tasks may race to build the app.
+    with _flask_app_lock:
+        if _flask_app is None:
+            from . import create_app
+            _flask_app = create_app(SQLALCHEMY_ENGINE_OPTIONS=worker_engine_options())
+    return _flask_app
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    # Runs in each prefork child after the fork, so the engine and its pool
+    # are never shared across processes.
+    make_flask_app()
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_process(**kwargs):
+    metrics.flush()
+    if _flask_app is not None:
+        from .db import db
+        with _flask_app.app_context():
+            db.engine.dispose()
+
+
+@before_task_publish.connect
+def stamp_enqueued_at(headers=None, **kwargs):
+    headers.setdefault(ENQUEUED_HEADER, time.time())
+
+
+@task_prerun.connect
+def set_metrics_scope(task=None, **kwargs):
+    task.request.metrics_scope = metrics.current_scope.set(task.name.rsplit(".", 1)[-1])
+
+
+@task_postrun.connect
+def flush_task_metrics(task=None, **kwargs):
+    token = task.request.get("metrics_scope")
+    if token is not None:
+        metrics.current_scope.reset(token)
+    metrics.flush()
+
+
+@task_prerun.connect
+def mark_task_started(task=None, **kwargs):
+    enqueued_at = task.request.get(ENQUEUED_HEADER)
+    if enqueued_at is not None:
+        task.request.queue_wait = time.time() - enqueued_at
+
+
+@task_postrun.connect
+def record_task_latency(task=None, retval=None, state=None, **kwargs):
+    enqueued_at = task.request.get(ENQUEUED_HEADER)
+    # Skipped duplicates do no work; their coalesced follow-up is measured instead.
+    if enqueued_at is None or state != "SUCCESS" or (isinstance(retval, dict) and retval.get("skipped")):
+        return
+    try:
+        record_latency(
+            redis_client(Config.REDIS_URL),
+            task.name.rsplit(".", 1)[-1],
+            queue_wait=task.request.get("queue_wait", 0.0),
+            total=time.time() - enqueued_at
+        )
+    except Exception as e:
+        logger.warning(f"Failed to record latency for {task.name}: {e}")
 
 
 @celery.task(name="app.celery_app.task_initial_ingest")
+@singleton_task("app.celery_app.task_initial_ingest")
 def task_initial_ingest(start_year=2010, end_year=None, min_votes=50, max_pages_per_year=50):
-    app = make_flask_app()
-    with app.app_context():
+    # tmdb (requests) and ml (pandas, scikit-learn) are imported by the tasks
+    # that use them, so beat and the other queues' workers never load them.
+    from .tmdb import initial_ingest_movies
+    with make_flask_app().app_context():
         res = initial_ingest_movies(
             start_year=start_year,
             end_year=end_year,
@@ -49,9 +143,11 @@ def task_initial_ingest(start_year=2010, end_year=None, min_votes=50, max_pages_
 
 
 @celery.task(name="app.celery_app.task_update_movies")
+@profiled_task("task_update_movies")
+@singleton_task("app.celery_app.task_update_movies")
 def task_update_movies(min_votes=50, max_pages=5):
-    app = make_flask_app()
-    with app.app_context():
+    from .tmdb import update_movies_incremental
+    with make_flask_app().app_context():
         res = update_movies_incremental(
             min_votes=min_votes,
             max_pages=max_pages
@@ -60,17 +156,32 @@ def task_update_movies(min_votes=50, max_pages=5):
 
 
 @celery.task(name="app.celery_app.task_ingest")
+@singleton_task("app.celery_app.task_ingest")
 def task_ingest():
+    from .segments import parse_segments
+    from .tmdb import collect_movies_by_year_range
     app = make_flask_app()
     with app.app_context():
-        res = collect_movies_by_year_range()
-        return res
+        return {
+            segment: collect_movies_by_year_range(segment=segment)
+            for segment in parse_segments(app.config["TRAIN_SEGMENTS"])
+        }
 
 
 @celery.task(name="app.celery_app.task_train")
+@profiled_task("task_train")
+@singleton_task("app.celery_app.task_train")
 def task_train():
+    from .ml import train_segments
     app = make_flask_app()
     with app.app_context():
-        res = train_all_horror_models()
-        return res
+        res = train_segments()
+
+    if any(r.get("trained") for models in res.values() for r in models.values()):
+        try:
+            publish_analysis(app.config["REDIS_URL"], res)
+        except Exception as e:
+            logger.warning(f"Failed to publish analysis event: {e}")
+
+    return res
 
@@ -0,0 +1,117 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+# Each entry point is started the way its service starts it, in a fresh
+# interpreter. Budgets are generous wall-clock ceilings; the forbidden module
+# lists are the real guard against heavy imports creeping back in.
+ENTRY_POINTS = {
+    "beat": {
+        "code": "import app.celery_app",
+        "budget_ms": 800,
+        "forbidden": ["pandas", "sklearn", "requests", "numpy", "pyarrow", "flask_sqlalchemy"],
+    },
+    "worker": {
+        "code": "import app.celery_app; app.celery_app.make_flask_app()",
+        "budget_ms": 1500,
+        "forbidden": ["pandas", "sklearn", "requests", "numpy", "pyarrow"],
+    },
+    "web": {
+        "code": "from app import create_app; create_app()",
+        "budget_ms": 1500,
+        "forbidden": ["pandas", "sklearn", "requests", "numpy", "pyarrow", "celery"],
+    },
+    "events": {
+        "code": "from app import create_events_app; create_events_app()",
+        "budget_ms": 800,
+        "forbidden": ["pandas", "sklearn", "requests", "numpy", "pyarrow", "sqlalchemy", "celery"],
+    },
+}
+
+REPORT_RSS = "import resource, sys; print('maxrss_kb', resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, file=sys.stderr)"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure(code):
+    env = dict(os.environ)
+    # create_app runs a SELECT 1, so fall back to a throwaway SQLite file.
+    env.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'import_budget.db')}")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"{code}\n{REPORT_RSS}"],
+        capture_output=True, text=True, env=env
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    modules = {}
+    total_us = 0
+    rss_kb = 0
+    for line in proc.stderr.splitlines():
+        if line.startswith("maxrss_kb "):
+            rss_kb = int(line.split()[1])
+            continue
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        _, cumulative, indent, name = match.groups()
+        modules[name] = int(cumulative)
+        if len(indent) == 1:
+            total_us += int(cumulative)
+
+    return {"import_ms": total_us / 1000, "rss_mb": rss_kb / 1024, "modules": modules}
+
+
+def check_entry_point(name, spec, budget_scale=1.0):
+    result = measure(spec["code"])
+    loaded = [m for m in spec["forbidden"] if m in result["modules"]]
+    budget_ms = spec["budget_ms"] * budget_scale
+    top = sorted(
+        ((m, us) for m, us in result["modules"].items() if m.startswith("app.") or "." not in m),
+        key=lambda item: item[1], reverse=True
+    )[:5]
+    return {
+        "entry_point": name,
+        "import_ms": round(result["import_ms"], 1),
+        "budget_ms": budget_ms,
+        "rss_mb": round(result["rss_mb"], 1),
+        "forbidden_loaded": loaded,
+        "slowest": [{"module": m, "ms": round(us / 1000, 1)} for m, us in top],
+        "ok": not loaded and result["import_ms"] <= budget_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check start-up import time and heavy imports of the beat, worker, web and events entry points."
+    )
+    parser.add_argument("entry_points", nargs="*", help=f"Subset of: {', '.join(ENTRY_POINTS)}")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="Multiply every budget, e.g. 2 on slow machines")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    unknown = set(args.entry_points) - set(ENTRY_POINTS)
+    if unknown:
+        parser.error(f"unknown entry points: {', '.join(sorted(unknown))}")
+
+    names = args.entry_points or list(ENTRY_POINTS)
+    results = [check_entry_point(name, ENTRY_POINTS[name], args.budget_scale) for name in names]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for r in results:
+            status = "ok" if r["ok"] else "FAIL"
+            print(f"{status:4}  {r['entry_point']:7} {r['import_ms']:7.1f}ms / {r['budget_ms']:.0f}ms  rss={r['rss_mb']:.0f}MB")
+            if r["forbidden_loaded"]:
+                print(f"      importa módulos pesados: {', '.join(r['forbidden_loaded'])}")
+            print("      " + ", ".join(f"{s['module']} {s['ms']:.0f}ms" for s in r["slowest"]))
+
+    sys.exit(0 if all(r["ok"] for r in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import argparse
+import re
+import sys
+from collections import defaultdict
+import requests
+from app import create_app
+from app import tmdb
+from app.fake_tmdb import create_fake_tmdb_app, serve_in_thread
+from app.metrics import REGISTRY
+
+SAMPLE_LINE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})? (\S+)$')
+LABEL_PAIR = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+EXERCISED = ["http_request_duration_seconds", "tmdb_request_duration_seconds", "db_statements_total"]
+
+
+def parse_exposition(text):
+    types, samples, errors = {}, defaultdict(list), []
+    for n, line in enumerate(text.splitlines(), 1):
+        if not line or line.startswith("# HELP"):
+            continue
+        if line.startswith("# TYPE"):
+            _, _, name, kind = line.split(" ", 3)
+            types[name] = kind
+            continue
+        match = SAMPLE_LINE.match(line)
+        if not match:
+            errors.append(f"line {n}: not a valid sample: {line!r}")
+            continue
+        name, labels, value = match.groups()
+        family = re.sub(r"_(bucket|sum|count)$", "", name) if name not in types else name
+        if family not in types:
+            errors.append(f"line {n}: {name} has no # TYPE")
+        try:
+            value = float(value)
+        except ValueError:
+            errors.append(f"line {n}: bad value {value!r}")
+            continue
+        samples[family].append((name, dict(LABEL_PAIR.findall(labels or "")), value))
+    return types, samples, errors
+
+
+def check_histograms(types, samples):
+    errors = []
+    for family, kind in types.items():
+        if kind != "histogram":
+            continue
+        series = defaultdict(lambda: {"buckets": [], "count": None})
+        for name, labels, value in samples.get(family, []):
+            le = labels.pop("le", None)
+            key = tuple(sorted(labels.items()))
+            if name.endswith("_bucket"):
+                series[key]["buckets"].append((float(le), value))
+            elif name.endswith("_count"):
+                series[key]["count"] = value
+        for key, s in series.items():
+            counts = [v for _, v in sorted(s["buckets"])]
+            if counts != sorted(counts):
+                errors.append(f"{family}{dict(key)}: bucket counts are not cumulative")
+            if not counts or counts[-1] != s["count"]:
+                errors.append(f"{family}{dict(key)}: +Inf bucket does not match _count")
+    return errors
+
+
+def generate_traffic(app, tmdb_url):
+    client = app.test_client()
+    for path in ["/api/health", "/api/horror/dashboard", "/api/movies/search?q=night", "/api/horror/similar/1"]:
+        client.get(path)
+    with app.app_context():
+        app.config["TMDB_BASE_URL"] = tmdb_url
+        app.config["TMDB_API_KEY"] = "fake-key"
+        for path in ["/movie/1", "/movie/999999999", "/discover/movie"]:
+            try:
+                tmdb.tmdb_get(path)
+            except requests.HTTPError:
+                pass
+    return client.get("/metrics")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape /metrics and validate the Prometheus text format.")
+    parser.add_argument("--url", help="Scrape a running server (e.g. http://localhost:8000/metrics) instead of "
+                                      "generating traffic against an in-process app")
+    parser.add_argument("--require", nargs="*", default=None, help="Metric families that must have samples")
+    args = parser.parse_args()
+
+    if args.url:
+        response = requests.get(args.url, timeout=10)
+        status, content_type, text = response.status_code, response.headers.get("Content-Type", ""), response.text
+        required = args.require or []
+    else:
+        server, tmdb_url = serve_in_thread(create_fake_tmdb_app(movies=100))
+        try:
+            response = generate_traffic(create_app(), tmdb_url)
+        finally:
+            server.shutdown()
+        status, content_type, text = response.status_code, response.content_type, response.get_data(as_text=True)
+        required = args.require if args.require is not None else EXERCISED
+
+    errors = []
+    if status != 200:
+        errors.append(f"/metrics answered {status}")
+    if not content_type.startswith("text/plain"):
+        errors.append(f"unexpected Content-Type {content_type!r}")
+
+    types, samples, parse_errors = parse_exposition(text)
+    errors += parse_errors + check_histograms(types, samples)
+    errors += [f"{name} is not exposed" for name in REGISTRY if name not in types]
+    errors += [f"{name} has no samples" for name in required if not samples.get(name)]
+
+    for name in REGISTRY:
+        print(f"{'ok' if samples.get(name) else '--':3} {name} ({len(samples.get(name, []))} amostras)")
+    for error in errors:
+        print(f"❌ {error}")
+    if not errors:
+        print("✅ /metrics válido")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import argparse
+import json
+import math
+import sys
+from sqlalchemy import text
+from app import create_app
+from app.db import db
+from app.models import Snapshot, HorrorClustering
+from app.routes.api import _predictions_query, _clusters_query, _with_titles
+from app.sampling import page_query, stratified_query
+from app.tmdb import oldest_movies_query
+
+SEED_ID_OFFSET = 900_000_000_000
+
+GUARDED_TABLES = {
+    "movies",
+    "movie_snapshots",
+    "horror_regression_predictions",
+    "horror_clustering",
+}
+
+SEED_SQL = [
+    """
+    INSERT INTO movies (tmdb_id, title, genres, language, release_date, popularity,
+                        vote_count, vote_average, runtime, inserted_at, updated_at)
+    SELECT :offset + g, 'Seed movie ' || g,
+           CASE WHEN g % 5 = 0 THEN 'Horror,Thriller' ELSE 'Drama' END,
+           'en', DATE '1990-01-01' + (g % 12000), random() * 100,
+           (random() * 5000)::int, random() * 10, 90,
+           now(), now() - make_interval(mins => g)
+    FROM generate_series(1, :movies) AS g
+    """,
+    """
+    INSERT INTO movie_snapshots (tmdb_id, snapshot_ts, popularity, vote_count, vote_average)
+    SELECT :offset + g, now() - make_interval(days => s), random() * 100, 0, random() * 10
+    FROM generate_series(1, :movies) AS g, generate_series(1, :snapshots) AS s
+    """,
+    """
+    INSERT INTO horror_regression_predictions (analysis_ts, tmdb_id, actual_popularity, predicted_popularity)
+    SELECT now() - make_interval(hours => r), :offset + g, random() * 100, random() * 100
+    FROM generate_series(1, :runs) AS r, generate_series(5, :movies, 5) AS g
+    """,
+    """
+    INSERT INTO horror_clustering (analysis_ts, tmdb_id, cluster_id, pca_x, pca_y)
+    SELECT now() - make_interval(hours => r), :offset + g, g % 4, random(), random()
+    FROM generate_series(1, :runs) AS r, generate_series(5, :movies, 5) AS g
+    """,
+]
+
+
+def hot_queries(sample_id, stride):
+    return {
+        "regression_predictions_first_page": _with_titles(page_query(_predictions_query(), 500)),
+        "regression_predictions_next_page": _with_titles(page_query(_predictions_query(), 500, cursor=1)),
+        "clustering_pca_first_page": _with_titles(page_query(_clusters_query(), 500)),
+        # The dashboard's default payload: a stratified sample of the latest run.
+        "dashboard_predictions_stratified": _with_titles(stratified_query(_predictions_query(), stride)),
+        "dashboard_clusters_stratified": _with_titles(
+            stratified_query(_clusters_query(), stride, partition_by="cluster_id")
+        ),
+        "update_oldest_movies": oldest_movies_query(20),
+        "movie_snapshot_history": db.session.query(Snapshot)
+            .filter(Snapshot.tmdb_id == sample_id)
+            .order_by(Snapshot.snapshot_ts.desc()),
+        "clustering_by_movie": db.session.query(HorrorClustering)
+            .filter(HorrorClustering.tmdb_id == sample_id),
+    }
+
+
+def seq_scans(plan):
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in GUARDED_TABLES:
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+
+def explain(conn, query):
+    compiled = query.statement.compile(dialect=conn.dialect)
+    result = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    plan = result if isinstance(result, list) else json.loads(result)
+    return plan[0]["Plan"]
+
+
+def check_query_plans(database_url, movies, snapshots, runs, verbose=False):
+    app = create_app(SQLALCHEMY_DATABASE_URI=database_url, SQLALCHEMY_BINDS={})
+    with app.app_context():
+        if db.engine.dialect.name != "postgresql":
+            print("❌ A verificação de planos requer PostgreSQL")
+            return False
+
+        failures = []
+        conn = db.engine.connect()
+        trans = conn.begin()
+        try:
+            # Everything below runs in one transaction that is rolled back, so
+            # the seeded rows never become visible to the application.
+            db.metadata.create_all(conn)
+            params = {"offset": SEED_ID_OFFSET, "movies": movies, "snapshots": snapshots, "runs": runs}
+            for sql in SEED_SQL:
+                conn.execute(text(sql), params)
+            for table in sorted(GUARDED_TABLES):
+                conn.execute(text(f"ANALYZE {table}"))
+
+            stride = math.ceil(movies / 5 / app.config["SCATTER_POINT_BUDGET"])
+            for name, query in hot_queries(SEED_ID_OFFSET + movies // 2, stride).items():
+                plan = explain(conn, query)
+                scanned = seq_scans(plan)
+                status = "FAIL" if scanned else "ok"
+                print(f"{status:4}  {name}" + (f"  (seq scan on {', '.join(scanned)})" if scanned else ""))
+                if verbose:
+                    print(json.dumps(plan, indent=2))
+                if scanned:
+                    failures.append(name)
+        finally:
+            trans.rollback()
+            conn.close()
+
+        return not failures
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Seed a large dataset in a rolled-back transaction and EXPLAIN the hot queries."
+    )
+    parser.add_argument("--database-url", required=True, help="Database whose indexes are checked; seeded rows are rolled back")
+    parser.add_argument("--movies", type=int, default=200_000)
+    parser.add_argument("--snapshots", type=int, default=5, help="Snapshots per movie")
+    parser.add_argument("--runs", type=int, default=5, help="Analysis runs kept in the results tables")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    ok = check_query_plans(args.database_url, args.movies, args.snapshots, args.runs, args.verbose)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
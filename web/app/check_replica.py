@@ -0,0 +1,139 @@
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import insert, select
+from app import create_app
+from app import db as db_module
+from app import ml
+from app.db import db, RECENT_WRITES_KEY, REPLICA_BIND
+from app.events import redis_client
+from app.models import HorrorClassification, HorrorRegression, Movie
+
+# The stand-in replica is a separate database that never receives the
+# primary's writes, so the rows a read returns tell which side served it.
+
+
+def seed(engine, origin):
+    with engine.begin() as conn:
+        conn.execute(insert(HorrorRegression), [{
+            "segment": "horror",
+            "analysis_ts": datetime.utcnow() - timedelta(hours=1),
+            "feature_name": origin,
+            "feature_importance": 1.0,
+            "mae": 0.0,
+            "r2_score": 0.0
+        }])
+        conn.execute(insert(HorrorClassification), [{
+            "segment": "horror",
+            "analysis_ts": datetime.utcnow() - timedelta(hours=1),
+            "confusion_matrix": "[]",
+            "roc_curve": "{}",
+            "auc_score": 0.5,
+            "accuracy": 1.0 if origin == "replica" else 0.0
+        }])
+        conn.execute(insert(Movie), [{
+            "tmdb_id": 1,
+            "title": origin,
+            "genres": "Horror",
+            "language": "en",
+            "popularity": 1.0,
+            "vote_count": 10,
+            "vote_average": 5.0,
+            "runtime": 90
+        }])
+
+
+def served_by(client):
+    features = client.get("/api/horror/regression/features").get_json()["features"]
+    return features[0]["name"] if features else None
+
+
+def forget_recent_writes(app):
+    db_module._local_writes.clear()
+    db_module._published_at.clear()
+    redis_client(app.config["REDIS_URL"]).delete(RECENT_WRITES_KEY)
+
+
+def run_checks(app, window):
+    client = app.test_client()
+    checks = []
+
+    def check(name, got, expected):
+        checks.append((name, got == expected, got, expected))
+
+    forget_recent_writes(app)
+    check("GET lê da réplica", served_by(client), "replica")
+    check("varredura do treino lê da réplica", ml.get_catalog()["title"].tolist(), ["replica"])
+
+    db.session.add(HorrorRegression(
+        segment="horror",
+        analysis_ts=datetime.utcnow(),
+        feature_name="primary-write",
+        feature_importance=2.0,
+        mae=0.0,
+        r2_score=0.0
+    ))
+    db.session.flush()
+    check("leitura na mesma transação da escrita usa o primário",
+          db.session.scalars(select(HorrorRegression.feature_name).order_by(HorrorRegression.id.desc())).first(),
+          "primary-write")
+    db.session.commit()
+    db.session.remove()
+
+    with db.engines[REPLICA_BIND].connect() as conn:
+        replica_rows = conn.scalars(select(HorrorRegression.feature_name)).all()
+    check("escritas vão só para o primário", "primary-write" in replica_rows, False)
+    check("GET logo após o commit lê o primário (read-your-writes)", served_by(client), "primary-write")
+    check("treino ignora read-your-writes", ml.get_catalog()["title"].tolist(), ["replica"])
+
+    time.sleep(window + db_module.PUBLISH_EVERY_SECONDS + 0.5)
+    check("GET volta para a réplica após a janela", served_by(client), "replica")
+
+    # A commit from another process (e.g. task_train in the worker) is only
+    # visible through the marker it published to Redis.
+    redis_client(app.config["REDIS_URL"]).hset(RECENT_WRITES_KEY, "horror_regression", time.time() + window)
+    check("GET após escrita de outro processo lê o primário", served_by(client), "primary-write")
+    check("GET de tabela não escrita continua na réplica",
+          client.get("/api/horror/classification").get_json()["metrics"]["accuracy"], 1.0)
+
+    return checks
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check read-replica routing against a second local database standing in for the replica."
+    )
+    parser.add_argument("--database-url", required=True, help="Throwaway primary database; tables are dropped")
+    parser.add_argument("--replica-url", required=True, help="Throwaway second database used as the replica")
+    parser.add_argument("--window", type=float, default=2.0, help="REPLICA_READ_YOUR_WRITES_SECONDS for the check")
+    args = parser.parse_args()
+
+    app = create_app(
+        SQLALCHEMY_DATABASE_URI=args.database_url,
+        SQLALCHEMY_BINDS={REPLICA_BIND: args.replica_url},
+        REPLICA_READ_YOUR_WRITES_SECONDS=args.window
+    )
+    with app.app_context():
+        engines = {"primary": db.engines[None], "replica": db.engines[REPLICA_BIND]}
+        for origin, engine in engines.items():
+            db.metadata.drop_all(engine)
+            db.metadata.create_all(engine)
+            seed(engine, origin)
+
+        try:
+            checks = run_checks(app, args.window)
+        finally:
+            db.session.remove()
+            for engine in engines.values():
+                db.metadata.drop_all(engine)
+
+    for name, ok, got, expected in checks:
+        print(f"{'ok' if ok else '❌'}  {name}" + ("" if ok else f" (obtido {got!r}, esperado {expected!r})"))
+    failed = [c for c in checks if not c[1]]
+    print("✅ Roteamento para a réplica OK" if not failed else f"❌ {len(failed)} verificações falharam")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
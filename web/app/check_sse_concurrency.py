@@ -0,0 +1,120 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+from urllib.parse import urlsplit
+
+
+async def open_stream(host, port, path):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(
+        f"GET {path} HTTP/1.1\r\nHost: {host}\r\nAccept: text/event-stream\r\n\r\n".encode()
+    )
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    if b" 200 " not in head.split(b"\r\n", 1)[0]:
+        raise RuntimeError(head.split(b"\r\n", 1)[0].decode())
+    return reader, writer
+
+
+async def wait_for_event(reader, timeout):
+    deadline = time.monotonic() + timeout
+    buffer = b""
+    while time.monotonic() < deadline:
+        try:
+            chunk = await asyncio.wait_for(reader.read(4096), deadline - time.monotonic())
+        except asyncio.TimeoutError:
+            break
+        if not chunk:
+            break
+        buffer += chunk
+        if b"event: analysis" in buffer:
+            return True
+    return False
+
+
+async def timed_get(host, port, path):
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    status = (await reader.readline()).decode().strip()
+    await reader.read()
+    writer.close()
+    return status, (time.perf_counter() - start) * 1000
+
+
+async def run(url, clients, probe_path, publish_redis, event_timeout, timeout):
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(asyncio.wait_for(open_stream(host, port, parts.path), timeout) for _ in range(clients)),
+        return_exceptions=True
+    )
+    streams = [r for r in results if not isinstance(r, Exception)]
+    failures = [r for r in results if isinstance(r, Exception)]
+    open_seconds = time.perf_counter() - start
+
+    probes = []
+    for _ in range(20):
+        try:
+            probes.append(await asyncio.wait_for(timed_get(host, port, probe_path), timeout))
+        except (asyncio.TimeoutError, OSError) as e:
+            probes.append((type(e).__name__, timeout * 1000))
+    latencies = sorted(ms for _, ms in probes)
+
+    report = {
+        "clients_requested": clients,
+        "clients_connected": len(streams),
+        "connect_failures": len(failures),
+        "connect_seconds": round(open_seconds, 2),
+        "probe_status": probes[-1][0],
+        "probe_p50_ms": round(latencies[len(latencies) // 2], 2),
+        "probe_max_ms": round(latencies[-1], 2),
+    }
+
+    if publish_redis:
+        from app.events import publish_analysis
+        waiters = [asyncio.ensure_future(wait_for_event(r, event_timeout)) for r, _ in streams]
+        await asyncio.sleep(0.5)
+        publish_analysis(publish_redis, {"check": {"regression": {"trained": True}}})
+        received = await asyncio.gather(*waiters)
+        report["events_received"] = sum(received)
+
+    for _, writer in streams:
+        writer.close()
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Hold many idle SSE connections open and verify the server still answers other requests."
+    )
+    parser.add_argument("--url", default="http://localhost:8001/api/horror/events")
+    parser.add_argument("--clients", type=int, default=2000)
+    parser.add_argument("--probe-path", default="/api/horror/events/health")
+    parser.add_argument("--publish-redis", help="Redis URL used to publish a test event to every client")
+    parser.add_argument("--event-timeout", type=float, default=10.0)
+    parser.add_argument("--timeout", type=float, default=5.0, help="Per-connection and per-probe timeout in seconds")
+    parser.add_argument("--max-probe-ms", type=float, default=500.0)
+    args = parser.parse_args()
+
+    report = asyncio.run(run(
+        args.url, args.clients, args.probe_path, args.publish_redis, args.event_timeout, args.timeout
+    ))
+    print(json.dumps(report, indent=2))
+
+    ok = (
+        report["clients_connected"] == args.clients
+        and report["probe_max_ms"] <= args.max_probe_ms
+        and report.get("events_received", args.clients) == report["clients_connected"]
+    )
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
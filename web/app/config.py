@@ -5,7 +5,52 @@ class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "dev")
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Optional read replica: GET requests and the training catalog scan read
+    # from it, everything else (and every write) uses DATABASE_URL. After a
+    # commit touches a table, requests keep reading that table from the
+    # primary for REPLICA_READ_YOUR_WRITES_SECONDS.
+    SQLALCHEMY_BINDS = {"replica": os.getenv("DATABASE_REPLICA_URL")} if os.getenv("DATABASE_REPLICA_URL") else {}
+    REPLICA_READ_YOUR_WRITES_SECONDS = float(os.getenv("REPLICA_READ_YOUR_WRITES_SECONDS", "10"))
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_pre_ping": True,
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "300")),
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "5")),
+    }
+    # Prefork children run one task at a time, so each needs very few connections;
+    # threads-pool workers raise CELERY_DB_POOL_SIZE to their concurrency.
+    CELERY_DB_POOL_SIZE = int(os.getenv("CELERY_DB_POOL_SIZE", "1"))
+    CELERY_DB_MAX_OVERFLOW = int(os.getenv("CELERY_DB_MAX_OVERFLOW", "2"))
+    # Enqueue (beat) to snapshot commit, measured by python -m app.task_slo.
+    UPDATE_SNAPSHOT_SLO_SECONDS = float(os.getenv("UPDATE_SNAPSHOT_SLO_SECONDS", "300"))
+    # Genre segments collected by task_ingest and trained by task_train
+    # (see app.segments). Segments are fitted in parallel, up to
+    # TRAIN_PROCESSES at a time (0 = one per CPU).
+    TRAIN_SEGMENTS = os.getenv("TRAIN_SEGMENTS", "horror")
+    TRAIN_PROCESSES = int(os.getenv("TRAIN_PROCESSES", "0"))
     TMDB_API_KEY = os.getenv("TMDB_API_KEY")
+    TMDB_BASE_URL = os.getenv("TMDB_BASE_URL", "https://api.themoviedb.org/3")
     REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
-    POLL_INTERVAL_MS = int(os.getenv("POLL_INTERVAL_MS", "30000"))
+    # Each process pushes its buffered metrics to Redis this often; /metrics
+    # reads the shared totals.
+    METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+    # Profiling is off unless a target is listed here (task_train,
+    # task_update_movies, api or all), a task gets profile=True, or a request
+    # sends X-Profile with PROFILE_TOKEN.
+    PROFILE_TARGETS = os.getenv("PROFILE_TARGETS", "")
+    PROFILE_TOKEN = os.getenv("PROFILE_TOKEN")
+    PROFILE_DIR = os.getenv("PROFILE_DIR", "/tmp/tmdb-profiles")
+    PROFILE_MAX_ARTIFACTS = int(os.getenv("PROFILE_MAX_ARTIFACTS", "50"))
+    PROFILE_MAX_STATEMENTS = int(os.getenv("PROFILE_MAX_STATEMENTS", "5000"))
+    SCATTER_POINT_BUDGET = int(os.getenv("SCATTER_POINT_BUDGET", "2000"))
+    API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "10000"))
+    SEARCH_CANDIDATE_LIMIT = int(os.getenv("SEARCH_CANDIDATE_LIMIT", "1000"))
+    SIMILARITY_RECHECK_SECONDS = float(os.getenv("SIMILARITY_RECHECK_SECONDS", "30"))
+    # The stream is served only by the events service (create_events_app).
+    # Pub/sub drops messages while a listener reconnects, so the dashboard
+    # also refetches (usually a 304) every EVENTS_FALLBACK_REFRESH_MS.
+    EVENTS_URL = os.getenv("EVENTS_URL", "http://localhost:8001/api/horror/events")
+    EVENTS_FALLBACK_REFRESH_MS = int(os.getenv("EVENTS_FALLBACK_REFRESH_MS", "300000"))
+    EVENTS_ALLOW_ORIGIN = os.getenv("EVENTS_ALLOW_ORIGIN", "*")
+    EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
 
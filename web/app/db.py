@@ -1,12 +1,191 @@
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import text
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import TextClause
+from sqlalchemy.sql.util import find_tables
 
-db = SQLAlchemy()
+logger = logging.getLogger(__name__)
+
+REPLICA_BIND = "replica"
+RECENT_WRITES_KEY = "tmdb:db:recent_writes"
+ANY_TABLE = "*"
+# Each process republishes a table's write marker at most this often; the
+# marker's expiry is padded by the same amount to cover skipped writes.
+PUBLISH_EVERY_SECONDS = 1.0
+# Only meaningful for QueuePool; SQLite engines use SingletonThreadPool or
+# StaticPool, which reject them.
+POOL_SIZING_OPTIONS = ("pool_size", "max_overflow")
+
+# Unset, every statement goes to the primary. replica_reads() routes the
+# scope's plain reads to the replica; fresh scopes keep reading a table from
+# the primary for a while after any process committed a write to it.
+_read_scope = contextvars.ContextVar("replica_read_scope", default=None)
+
+_local_writes = {}
+_published_at = {}
+_writes_lock = threading.Lock()
+
+
+class ReadScope:
+    def __init__(self, fresh):
+        self.fresh = fresh
+        self.recent_writes = None
+
+
+def _is_read(clause):
+    if isinstance(clause, Select):
+        return True
+    return isinstance(clause, TextClause) and clause.text.lstrip()[:6].lower() in ("select", "with")
+
+
+def _load_recent_writes():
+    from flask import current_app
+    from .events import redis_client
+
+    with _writes_lock:
+        recent = dict(_local_writes)
+    try:
+        stored = redis_client(current_app.config["REDIS_URL"]).hgetall(RECENT_WRITES_KEY)
+    except Exception as e:
+        logger.warning(f"Cannot read recent writes, reading from the primary: {e}")
+        return {ANY_TABLE: float("inf")}
+    for table, expires in stored.items():
+        table = table.decode()
+        recent[table] = max(recent.get(table, 0.0), float(expires))
+    return recent
+
+
+def _recently_written(scope, clause):
+    if scope.recent_writes is None:
+        scope.recent_writes = _load_recent_writes()
+    now = time.time()
+    written = {table for table, expires in scope.recent_writes.items() if expires > now}
+    if not written:
+        return False
+    if ANY_TABLE in written or not isinstance(clause, Select):
+        return True
+    return any(t.name in written for t in find_tables(clause))
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        scope = _read_scope.get()
+        if (
+            bind is None
+            and scope is not None
+            and not self.info.get("written_tables")
+            and _is_read(clause)
+            and REPLICA_BIND in self._db.engines
+            and not (scope.fresh and _recently_written(scope, clause))
+        ):
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+
+
+@contextmanager
+def replica_reads(fresh=False):
+    token = _read_scope.set(ReadScope(fresh))
+    try:
+        yield
+    finally:
+        _read_scope.reset(token)
+
+
+def note_writes(tables, window_seconds, redis_url):
+    now = time.time()
+    expires = now + window_seconds + PUBLISH_EVERY_SECONDS
+    with _writes_lock:
+        for table in tables:
+            _local_writes[table] = expires
+        due = [t for t in tables if now - _published_at.get(t, 0.0) >= PUBLISH_EVERY_SECONDS]
+        for table in due:
+            _published_at[table] = now
+    if not due:
+        return
+    try:
+        from .events import redis_client
+        redis_client(redis_url).hset(RECENT_WRITES_KEY, mapping={t: expires for t in due})
+    except Exception as e:
+        logger.warning(f"Failed to publish recent writes to {', '.join(due)}: {e}")
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _track_flushed_tables(session, flush_context):
+    written = session.info.setdefault("written_tables", set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        written.add(obj.__table__.name)
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _track_statement_tables(state):
+    if _is_read(state.statement):
+        return
+    table = getattr(state.statement, "table", None)
+    state.session.info.setdefault("written_tables", set()).add(table.name if table is not None else ANY_TABLE)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _publish_written_tables(session):
+    from flask import current_app
+
+    tables = session.info.pop("written_tables", None)
+    if tables and REPLICA_BIND in session._db.engines:
+        note_writes(tables, current_app.config["REPLICA_READ_YOUR_WRITES_SECONDS"], current_app.config["REDIS_URL"])
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _forget_written_tables(session):
+    session.info.pop("written_tables", None)
+
+
+def engine_options(url, options):
+    if make_url(url).get_backend_name() == "sqlite":
+        return {k: v for k, v in options.items() if k not in POOL_SIZING_OPTIONS}
+    return dict(options)
+
+
+def _configure_engines(app):
+    # Flask-SQLAlchemy gives URL-only binds none of SQLALCHEMY_ENGINE_OPTIONS,
+    # so every engine gets them here, filtered for its own dialect.
+    options = app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {})
+    if app.config.get("SQLALCHEMY_DATABASE_URI"):
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(app.config["SQLALCHEMY_DATABASE_URI"], options)
+    app.config["SQLALCHEMY_BINDS"] = {
+        key: {**engine_options(value, options), "url": value} if isinstance(value, str) else value
+        for key, value in app.config.get("SQLALCHEMY_BINDS", {}).items()
+    }
 
 
 def init_db(app):
+    _configure_engines(app)
     db.init_app(app)
     with app.app_context():
         db.session.execute(text("SELECT 1"))
         db.session.commit()
+        if REPLICA_BIND in db.engines:
+            with db.engines[REPLICA_BIND].connect() as conn:
+                conn.execute(text("SELECT 1"))
+
+    if app.config.get("SQLALCHEMY_BINDS", {}).get(REPLICA_BIND):
+        from flask import g, request
+
+        @app.before_request
+        def route_reads_to_replica():
+            if request.method in ("GET", "HEAD"):
+                g.replica_scope = _read_scope.set(ReadScope(fresh=True))
 
+        @app.teardown_request
+        def reset_read_scope(exc=None):
+            token = g.pop("replica_scope", None)
+            if token is not None:
+                _read_scope.reset(token)
@@ -0,0 +1,98 @@
+import json
+import logging
+import queue
+import threading
+import time
+import redis
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_CHANNEL = "tmdb:horror:analysis_published"
+
+
+def redis_client(url):
+    if url.startswith("rediss://"):
+        return redis.from_url(url, ssl_cert_reqs=None)
+    return redis.from_url(url)
+
+
+def publish_analysis(redis_url, results):
+    payload = json.dumps({
+        "ts": time.time(),
+        "trained": {
+            segment: {name: bool(r.get("trained")) for name, r in models.items()}
+            for segment, models in results.items()
+        }
+    })
+    return redis_client(redis_url).publish(ANALYSIS_CHANNEL, payload)
+
+
+class EventHub:
+    def __init__(self, redis_url, channel=ANALYSIS_CHANNEL, reconnect_delay=5.0):
+        self.redis_url = redis_url
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._listener = None
+
+    def subscribe(self, maxsize=16):
+        q = queue.Queue(maxsize=maxsize)
+        with self._lock:
+            self._subscribers.add(q)
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name="event-hub", daemon=True)
+                self._listener.start()
+        return q
+
+    def unsubscribe(self, q):
+        with self._lock:
+            self._subscribers.discard(q)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def broadcast(self, data):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for q in subscribers:
+            try:
+                q.put_nowait(data)
+            except queue.Full:
+                pass
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = redis_client(self.redis_url).pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    data = message["data"]
+                    self.broadcast(data.decode("utf-8") if isinstance(data, bytes) else data)
+            except Exception as e:
+                logger.warning(f"Event hub lost connection to Redis: {e}")
+                time.sleep(self.reconnect_delay)
+
+
+def sse_message(data, event=None):
+    lines = []
+    if event:
+        lines.append(f"event: {event}")
+    lines.extend(f"data: {line}" for line in data.splitlines() or [""])
+    return "\n".join(lines) + "\n\n"
+
+
+def stream_events(hub, heartbeat_seconds=15.0, retry_ms=5000):
+    q = hub.subscribe()
+    try:
+        yield f"retry: {retry_ms}\n\n"
+        while True:
+            try:
+                data = q.get(timeout=heartbeat_seconds)
+            except queue.Empty:
+                yield ": keepalive\n\n"
+                continue
+            yield sse_message(data, event="analysis")
+    finally:
+        hub.unsubscribe(q)
@@ -0,0 +1,233 @@
+import argparse
+import csv
+import importlib.util
+import io
+import sys
+from datetime import date, datetime, timedelta
+from sqlalchemy import literal, select
+from .db import db
+from .models import Movie, Snapshot
+
+# pyarrow is optional and heavy; it is imported only when a Parquet or Arrow
+# export actually starts.
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+MOVIE_COLUMNS = [
+    ("tmdb_id", Movie.tmdb_id, "int64"),
+    ("imdb_id", Movie.imdb_id, "string"),
+    ("title", Movie.title, "string"),
+    ("original_title", Movie.original_title, "string"),
+    ("overview", Movie.overview, "string"),
+    ("language", Movie.language, "string"),
+    ("release_date", Movie.release_date, "date32"),
+    ("popularity", Movie.popularity, "float64"),
+    ("vote_count", Movie.vote_count, "int64"),
+    ("vote_average", Movie.vote_average, "float64"),
+    ("runtime", Movie.runtime, "int64"),
+    ("genres", Movie.genres, "string"),
+    ("inserted_at", Movie.inserted_at, "timestamp"),
+    ("updated_at", Movie.updated_at, "timestamp"),
+]
+
+SNAPSHOT_COLUMNS = [
+    ("id", Snapshot.id, "int64"),
+    ("tmdb_id", Snapshot.tmdb_id, "int64"),
+    ("snapshot_ts", Snapshot.snapshot_ts, "timestamp"),
+    ("popularity", Snapshot.popularity, "float64"),
+    ("vote_count", Snapshot.vote_count, "int64"),
+    ("vote_average", Snapshot.vote_average, "float64"),
+]
+
+
+class ExportParamsError(ValueError):
+    pass
+
+
+def parse_date(value, name):
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ExportParamsError(f"{name} must be an ISO date (YYYY-MM-DD)")
+
+
+def check_format(fmt):
+    if fmt not in EXPORT_FORMATS:
+        raise ExportParamsError(f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+    if fmt != "csv" and not HAS_PYARROW:
+        raise ExportParamsError(f"format {fmt} requires pyarrow, which is not installed")
+
+
+def _has_genre(genre):
+    # Same comma-delimited token match as ml._has_genre, with LIKE wildcards
+    # in the requested genre escaped.
+    escaped = genre.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return (literal(",") + Movie.genres + ",").like(f"%,{escaped},%", escape="\\")
+
+
+def movies_statement(start=None, end=None, genre=None):
+    stmt = select(*[c for _, c, _ in MOVIE_COLUMNS])
+    if start:
+        stmt = stmt.where(Movie.release_date >= start)
+    if end:
+        stmt = stmt.where(Movie.release_date <= end)
+    if genre:
+        stmt = stmt.where(_has_genre(genre))
+    return stmt.order_by(Movie.tmdb_id), MOVIE_COLUMNS
+
+
+def snapshots_statement(start=None, end=None, genre=None):
+    stmt = select(*[c for _, c, _ in SNAPSHOT_COLUMNS])
+    if start:
+        stmt = stmt.where(Snapshot.snapshot_ts >= datetime.combine(start, datetime.min.time()))
+    if end:
+        stmt = stmt.where(Snapshot.snapshot_ts < datetime.combine(end + timedelta(days=1), datetime.min.time()))
+    if genre:
+        stmt = stmt.join(Movie, Movie.tmdb_id == Snapshot.tmdb_id).where(_has_genre(genre))
+    return stmt.order_by(Snapshot.id), SNAPSHOT_COLUMNS
+
+
+def _row_chunks(stmt, chunk_size):
+    # yield_per makes psycopg2 use a named server-side cursor, so only one
+    # chunk of rows is ever held in memory.
+    result = db.session.execute(stmt.execution_options(yield_per=chunk_size))
+    try:
+        for rows in result.partitions(chunk_size):
+            yield rows
+    finally:
+        result.close()
+
+
+class _ChunkSink(io.RawIOBase):
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _arrow_schema(columns):
+    import pyarrow as pa
+
+    types = {
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "string": pa.string(),
+        "date32": pa.date32(),
+        "timestamp": pa.timestamp("us"),
+    }
+    return pa.schema([(name, types[kind]) for name, _, kind in columns])
+
+
+def _record_batch(rows, schema):
+    import pyarrow as pa
+
+    arrays = [
+        pa.array([row[i] for row in rows], type=field.type)
+        for i, field in enumerate(schema)
+    ]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def stream_csv(stmt, columns, chunk_size):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, _, _ in columns])
+    for rows in _row_chunks(stmt, chunk_size):
+        writer.writerows(rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def stream_arrow(stmt, columns, chunk_size, fmt):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(columns)
+    sink = _ChunkSink()
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(sink, schema, compression="snappy")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+
+    for rows in _row_chunks(stmt, chunk_size):
+        writer.write_batch(_record_batch(rows, schema))
+        data = sink.drain()
+        if data:
+            yield data
+
+    writer.close()
+    yield sink.drain()
+
+
+def stream_export(kind, fmt, start=None, end=None, genre=None, chunk_size=5000):
+    check_format(fmt)
+    if start and end and start > end:
+        raise ExportParamsError("start must not be after end")
+    if not 0 < chunk_size <= 100_000:
+        raise ExportParamsError("chunk_size must be between 1 and 100000")
+
+    if kind == "movies":
+        stmt, columns = movies_statement(start, end, genre)
+    elif kind == "snapshots":
+        stmt, columns = snapshots_statement(start, end, genre)
+    else:
+        raise ExportParamsError("kind must be movies or snapshots")
+
+    if fmt == "csv":
+        return stream_csv(stmt, columns, chunk_size)
+    return stream_arrow(stmt, columns, chunk_size, fmt)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream movies or snapshot history to CSV, Parquet or Arrow.")
+    parser.add_argument("kind", choices=["movies", "snapshots"])
+    parser.add_argument("--format", default="csv", choices=list(EXPORT_FORMATS))
+    parser.add_argument("--start", help="Start date (YYYY-MM-DD)")
+    parser.add_argument("--end", help="End date (YYYY-MM-DD)")
+    parser.add_argument("--genre", help="Only movies whose genres contain this name, e.g. Horror")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    args = parser.parse_args()
+
+    from . import create_app
+    app = create_app()
+    with app.app_context():
+        chunks = stream_export(
+            args.kind,
+            args.format,
+            start=parse_date(args.start, "start"),
+            end=parse_date(args.end, "end"),
+            genre=args.genre,
+            chunk_size=args.chunk_size
+        )
+        out = open(args.output, "wb") if args.output else sys.stdout.buffer
+        try:
+            for chunk in chunks:
+                out.write(chunk)
+        finally:
+            if args.output:
+                out.close()
+
+
+if __name__ == "__main__":
+    main()
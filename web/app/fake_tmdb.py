@@ -0,0 +1,213 @@
+import argparse
+import math
+import random
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime
+from flask import Flask, jsonify, request
+
+GENRES = {
+    27: "Horror", 53: "Thriller", 9648: "Mystery", 878: "Science Fiction", 14: "Fantasy",
+    28: "Action", 12: "Adventure", 35: "Comedy", 18: "Drama", 80: "Crime",
+    10749: "Romance", 16: "Animation", 99: "Documentary", 10751: "Family",
+}
+GENRE_IDS = list(GENRES)
+PAGE_SIZE = 20
+MAX_PAGE = 500
+WORDS = ["night", "house", "dark", "blood", "silent", "hollow", "last", "curse", "shadow", "return", "lake", "doll"]
+
+
+class FakeCatalog:
+    def __init__(self, size, start_year=2010, end_year=None, horror_share=0.3, seed=42):
+        end_year = end_year or datetime.now().year
+        rng = random.Random(seed)
+        self.movies = {}
+        for tmdb_id in range(1, size + 1):
+            genres = [27] if rng.random() < horror_share else []
+            genres += rng.sample([g for g in GENRE_IDS if g != 27], rng.randint(1, 3))
+            self.movies[tmdb_id] = {
+                "id": tmdb_id,
+                "year": rng.randint(start_year, end_year),
+                "genre_ids": genres,
+                "vote_count": int(rng.paretovariate(1.2) * 20),
+                "popularity": round(rng.lognormvariate(2.5, 1.0), 3),
+            }
+        self.by_popularity = sorted(self.movies.values(), key=lambda m: -m["popularity"])
+
+    def discover(self, year=None, genre=None, min_votes=0):
+        return [
+            m for m in self.by_popularity
+            if (year is None or m["year"] == year)
+            and (genre is None or genre in m["genre_ids"])
+            and m["vote_count"] >= min_votes
+        ]
+
+    def details(self, tmdb_id, drift_seconds=3600):
+        m = self.movies.get(tmdb_id)
+        if m is None:
+            return None
+        rng = random.Random(tmdb_id)
+        title = " ".join(rng.choice(WORDS).capitalize() for _ in range(rng.randint(1, 3)))
+        # Popularity and votes move slowly over wall-clock time, so repeated
+        # updates write snapshots with changing values like the real API.
+        tick = int(time.time() // drift_seconds)
+        drift = 1 + 0.05 * math.sin(tmdb_id + tick)
+        release = date(m["year"], rng.randint(1, 12), rng.randint(1, 28))
+        return {
+            "id": tmdb_id,
+            "imdb_id": f"tt{tmdb_id:07d}",
+            "title": title,
+            "original_title": title,
+            "overview": f"{title}. " + " ".join(rng.choice(WORDS) for _ in range(30)),
+            "original_language": rng.choice(["en", "en", "en", "es", "ja", "ko", "fr"]),
+            "release_date": release.isoformat(),
+            "popularity": round(m["popularity"] * drift, 3),
+            "vote_count": m["vote_count"] + tick % 7,
+            "vote_average": round(min(10.0, max(1.0, rng.gauss(6.0, 1.2))), 1),
+            "runtime": rng.randint(75, 150),
+            "genres": [{"id": g, "name": GENRES[g]} for g in m["genre_ids"]],
+            "poster_path": f"/poster{tmdb_id}.jpg",
+            "backdrop_path": f"/backdrop{tmdb_id}.jpg",
+        }
+
+
+def _list_item(m):
+    return {"id": m["id"], "popularity": m["popularity"], "vote_count": m["vote_count"], "genre_ids": m["genre_ids"]}
+
+
+def _page(movies, page):
+    total_pages = min(MAX_PAGE, math.ceil(len(movies) / PAGE_SIZE))
+    chunk = movies[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]
+    return {
+        "page": page,
+        "results": [_list_item(m) for m in chunk],
+        "total_pages": total_pages,
+        "total_results": len(movies),
+    }
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+def create_fake_tmdb_app(movies=5000, latency_ms=0.0, jitter_ms=0.0, rate_limit=0.0, burst=None,
+                         error_rate=0.0, start_year=2010, seed=42):
+    app = Flask(__name__)
+    catalog = FakeCatalog(movies, start_year=start_year, seed=seed)
+    bucket = TokenBucket(rate_limit, burst or max(1, int(rate_limit))) if rate_limit > 0 else None
+    rng = random.Random(seed)
+    stats = Counter()
+    stats_lock = threading.Lock()
+
+    def count(key):
+        with stats_lock:
+            stats[key] += 1
+
+    @app.before_request
+    def simulate_network():
+        if request.path == "/_stats":
+            return None
+        count("requests")
+        if not request.args.get("api_key") and not request.headers.get("Authorization"):
+            count("401")
+            return jsonify({"status_code": 7, "status_message": "Invalid API key: You must be granted a valid key."}), 401
+        if latency_ms or jitter_ms:
+            time.sleep(max(0.0, latency_ms + rng.uniform(-jitter_ms, jitter_ms)) / 1000.0)
+        if bucket is not None and not bucket.take():
+            count("429")
+            response = jsonify({"status_code": 25, "status_message": "Your request count is over the allowed limit."})
+            response.headers["Retry-After"] = "1"
+            return response, 429
+        if error_rate and rng.random() < error_rate:
+            count("500")
+            return jsonify({"status_code": 11, "status_message": "Internal error: Something went wrong."}), 500
+        return None
+
+    @app.get("/movie/popular")
+    def popular():
+        count("200")
+        return jsonify(_page(catalog.by_popularity, request.args.get("page", 1, type=int)))
+
+    @app.get("/discover/movie")
+    def discover():
+        count("200")
+        movies = catalog.discover(
+            year=request.args.get("primary_release_year", type=int),
+            genre=request.args.get("with_genres", type=int),
+            min_votes=request.args.get("vote_count.gte", 0, type=int)
+        )
+        return jsonify(_page(movies, request.args.get("page", 1, type=int)))
+
+    @app.get("/movie/<int:tmdb_id>")
+    def movie(tmdb_id):
+        details = catalog.details(tmdb_id)
+        if details is None:
+            count("404")
+            return jsonify({"status_code": 34, "status_message": "The resource you requested could not be found."}), 404
+        if "credits" in request.args.get("append_to_response", ""):
+            details["credits"] = {"cast": [{"id": tmdb_id * 10 + i, "name": f"Actor {i}"} for i in range(5)]}
+        count("200")
+        return jsonify(details)
+
+    @app.get("/_stats")
+    def server_stats():
+        with stats_lock:
+            return jsonify(dict(stats))
+
+    return app
+
+
+def serve_in_thread(app, host="127.0.0.1", port=0):
+    from werkzeug.serving import make_server
+
+    server = make_server(host, port, app, threaded=True)
+    threading.Thread(target=server.serve_forever, name="fake-tmdb", daemon=True).start()
+    return server, f"http://{host}:{server.server_port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the TMDB API, serving generated movies.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--movies", type=int, default=5000, help="Catalog size")
+    parser.add_argument("--start-year", type=int, default=2010)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Requests/s before answering 429 (0 = off)")
+    parser.add_argument("--burst", type=int, help="Token bucket size (default: one second of --rate-limit)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 500")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    app = create_fake_tmdb_app(
+        movies=args.movies,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_limit=args.rate_limit,
+        burst=args.burst,
+        error_rate=args.error_rate,
+        start_year=args.start_year,
+        seed=args.seed
+    )
+    print(f"🎬 TMDB falso com {args.movies} filmes em http://{args.host}:{args.port} (TMDB_BASE_URL)")
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
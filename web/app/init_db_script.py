@@ -1,9 +1,16 @@
 from app import create_app
 from app.db import db
+from app.migrate_horror_tables import add_segment_columns
+from app.search import ensure_search_index
 
 if __name__ == "__main__":
     app = create_app()
     with app.app_context():
         from app.models import Movie, Snapshot, ModelPrediction
         db.create_all()
+        # create_all never alters existing tables; the horror_* tables of a
+        # pre-segment database need the column before any API or task runs.
+        add_segment_columns()
+        with db.engine.begin() as conn:
+            ensure_search_index(conn)
         print("Database initialized successfully!")
@@ -0,0 +1,164 @@
+import argparse
+import json
+import logging
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+import requests
+from sqlalchemy import event
+from app import create_app
+from app import tmdb
+from app.db import db
+from app.fake_tmdb import create_fake_tmdb_app, serve_in_thread
+from app.task_slo import percentile
+
+
+class IngestProbe:
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = 0
+        self.latencies = defaultdict(list)
+        self.statuses = Counter()
+        self._tmdb_get = tmdb.tmdb_get
+
+    def _count_statement(self, *args):
+        self.statements += 1
+
+    def _timed_tmdb_get(self, path, params=None):
+        start = time.perf_counter()
+        status = 200
+        try:
+            return self._tmdb_get(path, params)
+        except requests.HTTPError as e:
+            status = e.response.status_code
+            raise
+        except requests.RequestException:
+            status = "connection_error"
+            raise
+        finally:
+            self.latencies[tmdb.endpoint_label(path)].append(time.perf_counter() - start)
+            self.statuses[status] += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._count_statement)
+        # The ingest functions resolve tmdb_get from the module globals on
+        # every call, so swapping it here times every request they make.
+        tmdb.tmdb_get = self._timed_tmdb_get
+        return self
+
+    def __exit__(self, *exc):
+        tmdb.tmdb_get = self._tmdb_get
+        event.remove(self.engine, "before_cursor_execute", self._count_statement)
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+def run_scenario(name, fn, engine):
+    with IngestProbe(engine) as probe:
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+
+    movies = result.get("total_snapshots", 0)
+    all_latencies = [v for values in probe.latencies.values() for v in values]
+    return {
+        "scenario": name,
+        "movies": movies,
+        "seconds": round(elapsed, 2),
+        "movies_per_second": round(movies / elapsed, 2) if elapsed else None,
+        "db_statements": probe.statements,
+        "db_statements_per_movie": round(probe.statements / movies, 2) if movies else None,
+        "requests": len(all_latencies),
+        "statuses": {str(k): v for k, v in probe.statuses.items()},
+        "latency_ms": {
+            endpoint: {"count": len(values), "p50": _ms(percentile(values, 50)), "p99": _ms(percentile(values, 99))}
+            for endpoint, values in [("all", all_latencies), *sorted(probe.latencies.items())]
+        },
+        "result": result,
+    }
+
+
+def print_report(report):
+    print(f"\n📊 {report['scenario']}: {report['movies']} filmes em {report['seconds']}s "
+          f"→ {report['movies_per_second']} filmes/s")
+    print(f"   statements SQL: {report['db_statements']} ({report['db_statements_per_movie']} por filme)")
+    print(f"   requisições: {report['requests']}  status: {report['statuses']}")
+    for endpoint, lat in report["latency_ms"].items():
+        print(f"   {endpoint:16} n={lat['count']:<6} p50={lat['p50']}ms p99={lat['p99']}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Drive initial_ingest_movies and update_movies_incremental against a local fake TMDB."
+    )
+    parser.add_argument("--database-url", required=True,
+                        help="Throwaway database; tables are created if missing and filled with generated movies")
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate all tables first")
+    parser.add_argument("--scenario", choices=["initial", "update", "both"], default="both")
+    parser.add_argument("--tmdb-url", help="Use an already running fake TMDB instead of starting one")
+    parser.add_argument("--movies", type=int, default=2000, help="Fake catalog size")
+    parser.add_argument("--start-year", type=int, default=datetime.now().year - 4)
+    parser.add_argument("--min-votes", type=int, default=0)
+    parser.add_argument("--max-pages", type=int, default=50, help="Pages per year (initial) / max_pages (update)")
+    parser.add_argument("--sleep-per-call", type=float, default=0.0,
+                        help="Pause after each movie, as the tasks do in production (0.1)")
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Fake TMDB requests/s before 429 (0 = off)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    server = None
+    tmdb_url = args.tmdb_url
+    if tmdb_url is None:
+        fake = create_fake_tmdb_app(
+            movies=args.movies,
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            rate_limit=args.rate_limit,
+            error_rate=args.error_rate,
+            start_year=args.start_year
+        )
+        logging.getLogger("werkzeug").setLevel(logging.WARNING)
+        server, tmdb_url = serve_in_thread(fake)
+        print(f"🎬 TMDB falso em {tmdb_url} ({args.movies} filmes)")
+
+    app = create_app(SQLALCHEMY_DATABASE_URI=args.database_url, SQLALCHEMY_BINDS={}, TMDB_BASE_URL=tmdb_url, TMDB_API_KEY="fake-key")
+    reports = []
+    try:
+        with app.app_context():
+            if args.reset:
+                db.drop_all()
+            db.create_all()
+
+            if args.scenario in ("initial", "both"):
+                reports.append(run_scenario("initial_ingest_movies", lambda: tmdb.initial_ingest_movies(
+                    start_year=args.start_year,
+                    min_votes=args.min_votes,
+                    max_pages_per_year=args.max_pages,
+                    sleep_per_call=args.sleep_per_call
+                ), db.engine))
+            if args.scenario in ("update", "both"):
+                reports.append(run_scenario("update_movies_incremental", lambda: tmdb.update_movies_incremental(
+                    min_votes=args.min_votes,
+                    max_pages=args.max_pages,
+                    sleep_per_call=args.sleep_per_call
+                ), db.engine))
+
+        for report in reports:
+            print_report(report)
+        if server is not None:
+            print(f"\n   servidor: {requests.get(f'{tmdb_url}/_stats', timeout=5).json()}")
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(reports, f, indent=2, default=str)
+    finally:
+        if server is not None:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
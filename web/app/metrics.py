@@ -0,0 +1,244 @@
+import bisect
+import contextvars
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from .config import Config
+from .events import redis_client
+
+logger = logging.getLogger(__name__)
+
+METRICS_PREFIX = "tmdb:metrics:"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PHASE_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0)
+
+# Where the current DB statements come from: the Celery task name in workers,
+# the Flask endpoint in the web app.
+current_scope = contextvars.ContextVar("metrics_scope", default="none")
+
+
+class Metric:
+    def __init__(self, name, kind, help_text, labels, buckets=None):
+        self.name = name
+        self.kind = kind
+        self.help = help_text
+        self.labels = labels
+        self.buckets = buckets
+
+    def label_key(self, values):
+        return ",".join(f'{k}="{_escape(str(v))}"' for k, v in zip(self.labels, values))
+
+
+REGISTRY = {}
+
+
+def _register(name, kind, help_text, labels, buckets=None):
+    REGISTRY[name] = Metric(name, kind, help_text, labels, buckets)
+    return REGISTRY[name]
+
+
+TMDB_REQUEST_SECONDS = _register(
+    "tmdb_request_duration_seconds", "histogram", "TMDB API request latency.",
+    ("endpoint", "status"), LATENCY_BUCKETS
+)
+DB_STATEMENTS = _register(
+    "db_statements_total", "counter", "SQL statements executed, by task or API endpoint.", ("scope",)
+)
+DB_STATEMENT_SECONDS = _register(
+    "db_statement_seconds_total", "counter", "Time spent executing SQL statements, by task or API endpoint.", ("scope",)
+)
+TRAINING_PHASE_SECONDS = _register(
+    "training_phase_duration_seconds", "histogram",
+    "Training time per segment, model and phase (load/featurize/fit/persist).",
+    ("segment", "model", "phase"), PHASE_BUCKETS
+)
+HTTP_REQUEST_SECONDS = _register(
+    "http_request_duration_seconds", "histogram", "API handler latency.",
+    ("endpoint", "method", "status"), LATENCY_BUCKETS
+)
+CACHE_REQUESTS = _register(
+    "cache_requests_total", "counter", "Cache lookups by cache and result (hit/miss).", ("cache", "result")
+)
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsBuffer:
+    # Observations are aggregated in memory and pushed to Redis as deltas, so
+    # every web and worker process adds to the same totals without paying a
+    # Redis round trip per request or statement.
+    def __init__(self, flush_seconds):
+        self.flush_seconds = flush_seconds
+        self._deltas = defaultdict(lambda: defaultdict(float))
+        self._lock = threading.Lock()
+        self._pid = None
+        self._failing = False
+
+    def _ensure_flusher(self):
+        if self._pid == os.getpid():
+            return
+        # First observation in this process (or after a fork): start a flusher.
+        self._pid = os.getpid()
+        self._deltas = defaultdict(lambda: defaultdict(float))
+        threading.Thread(target=self._run, name="metrics-flush", daemon=True).start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            self.flush()
+
+    def inc(self, metric, labels, value=1.0):
+        with self._lock:
+            self._ensure_flusher()
+            self._deltas[metric.name][metric.label_key(labels)] += value
+
+    def observe(self, metric, labels, value):
+        key = metric.label_key(labels)
+        bucket = bisect.bisect_left(metric.buckets, value)
+        with self._lock:
+            self._ensure_flusher()
+            fields = self._deltas[metric.name]
+            fields[f"{key}\tb{bucket}"] += 1
+            fields[f"{key}\tsum"] += value
+            fields[f"{key}\tcount"] += 1
+
+    def flush(self):
+        with self._lock:
+            deltas, self._deltas = self._deltas, defaultdict(lambda: defaultdict(float))
+        if not deltas:
+            return
+        try:
+            pipe = redis_client(Config.REDIS_URL).pipeline(transaction=False)
+            for name, fields in deltas.items():
+                for field, value in fields.items():
+                    pipe.hincrbyfloat(METRICS_PREFIX + name, field, value)
+            pipe.execute()
+            self._failing = False
+        except Exception as e:
+            if not self._failing:
+                logger.warning(f"Failed to push metrics to Redis, dropping them until it recovers: {e}")
+            self._failing = True
+
+
+_buffer = MetricsBuffer(Config.METRICS_FLUSH_SECONDS)
+inc = _buffer.inc
+observe = _buffer.observe
+flush = _buffer.flush
+
+
+class PhaseTimer:
+    def __init__(self, segment, model):
+        self.segment = segment
+        self.model = model
+        self.last = time.perf_counter()
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        observe(TRAINING_PHASE_SECONDS, (self.segment, self.model, phase), now - self.last)
+        self.last = now
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("metrics_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    scope = current_scope.get()
+    inc(DB_STATEMENTS, (scope,))
+    inc(DB_STATEMENT_SECONDS, (scope,), elapsed)
+
+
+def instrument_engine(engine):
+    from sqlalchemy import event
+
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def init_app(app):
+    from flask import Response, g, request
+    from .db import db
+
+    with app.app_context():
+        for engine in db.engines.values():
+            instrument_engine(engine)
+
+    @app.before_request
+    def start_request_timer():
+        g.metrics_start = time.perf_counter()
+        g.metrics_scope = current_scope.set(request.endpoint or "unknown")
+
+    @app.after_request
+    def record_request_latency(response):
+        start = g.pop("metrics_start", None)
+        if start is not None and request.endpoint != "metrics":
+            observe(
+                HTTP_REQUEST_SECONDS,
+                (request.endpoint or "unknown", request.method, response.status_code),
+                time.perf_counter() - start
+            )
+        return response
+
+    @app.teardown_request
+    def reset_scope(exc=None):
+        token = g.pop("metrics_scope", None)
+        if token is not None:
+            current_scope.reset(token)
+
+    @app.get("/metrics", endpoint="metrics")
+    def metrics_endpoint():
+        flush()
+        return Response(render(redis_client(app.config["REDIS_URL"])), mimetype=CONTENT_TYPE)
+
+
+def _fmt(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _sample(name, labels, value):
+    return f"{name}{{{labels}}} {_fmt(value)}" if labels else f"{name} {_fmt(value)}"
+
+
+def render(client):
+    pipe = client.pipeline(transaction=False)
+    for name in REGISTRY:
+        pipe.hgetall(METRICS_PREFIX + name)
+    stored = pipe.execute()
+
+    lines = []
+    for metric, raw in zip(REGISTRY.values(), stored):
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        fields = {k.decode(): float(v) for k, v in raw.items()}
+
+        if metric.kind == "counter":
+            for labels, value in sorted(fields.items()):
+                lines.append(_sample(metric.name, labels, value))
+            continue
+
+        series = defaultdict(dict)
+        for field, value in fields.items():
+            labels, part = field.rsplit("\t", 1)
+            series[labels][part] = value
+        for labels, parts in sorted(series.items()):
+            prefix = f"{labels}," if labels else ""
+            cumulative = 0.0
+            for i, bound in enumerate(metric.buckets):
+                cumulative += parts.get(f"b{i}", 0.0)
+                lines.append(_sample(f"{metric.name}_bucket", f'{prefix}le="{bound}"', cumulative))
+            lines.append(_sample(f"{metric.name}_bucket", f'{prefix}le="+Inf"', parts.get("count", 0.0)))
+            lines.append(_sample(f"{metric.name}_sum", labels, parts.get("sum", 0.0)))
+            lines.append(_sample(f"{metric.name}_count", labels, parts.get("count", 0.0)))
+
+    return "\n".join(lines) + "\n"
@@ -1,3 +1,4 @@
+from sqlalchemy import inspect, text
 from app import create_app
 from app.db import db
 from app.models import (
@@ -5,19 +6,46 @@ from app.models import (
     HorrorRegressionPrediction,
     HorrorClassification,
     HorrorClustering,
-    HorrorClusterProfile
+    HorrorClusterProfile,
+    HorrorSimilarityIndex
 )
 
+SEGMENTED_MODELS = (
+    HorrorRegression,
+    HorrorRegressionPrediction,
+    HorrorClassification,
+    HorrorClustering,
+    HorrorClusterProfile,
+    HorrorSimilarityIndex
+)
+
+
+def add_segment_columns():
+    # Tables created before segments existed: their rows are all horror.
+    inspector = inspect(db.engine)
+    for model in SEGMENTED_MODELS:
+        columns = {c["name"] for c in inspector.get_columns(model.__tablename__)}
+        if "segment" not in columns:
+            db.session.execute(text(
+                f"ALTER TABLE {model.__tablename__} "
+                f"ADD COLUMN segment VARCHAR(32) NOT NULL DEFAULT 'horror'"
+            ))
+            print(f"   + {model.__tablename__}.segment")
+    db.session.commit()
+
+
 def migrate_horror_tables():
     app = create_app()
     with app.app_context():
         db.create_all()
+        add_segment_columns()
         print("✅ Tabelas de análise de terror criadas com sucesso!")
         print("   - horror_regression")
         print("   - horror_regression_predictions")
         print("   - horror_classification")
         print("   - horror_clustering")
         print("   - horror_cluster_profiles")
+        print("   - horror_similarity_index")
 
 if __name__ == "__main__":
     migrate_horror_tables()
@@ -0,0 +1,69 @@
+from sqlalchemy import MetaData, text
+from sqlalchemy.schema import CreateIndex
+from app import create_app
+from app.db import db
+from app.migrate_horror_tables import add_segment_columns
+from app.models import (
+    Movie,
+    Snapshot,
+    HorrorRegression,
+    HorrorRegressionPrediction,
+    HorrorClassification,
+    HorrorClustering,
+    HorrorClusterProfile,
+    HorrorSimilarityIndex
+)
+
+MODELS = (
+    Movie,
+    Snapshot,
+    HorrorRegression,
+    HorrorRegressionPrediction,
+    HorrorClassification,
+    HorrorClustering,
+    HorrorClusterProfile,
+    HorrorSimilarityIndex
+)
+
+# Superseded by the segment-leading indexes declared on the models.
+REPLACED_INDEXES = (
+    "ix_horror_regression_ts_importance",
+    "ix_horror_regression_predictions_ts_id",
+    "ix_horror_clustering_ts_id",
+    "ix_horror_cluster_profiles_ts_cluster",
+)
+
+
+def migrate_indexes():
+    app = create_app()
+    with app.app_context():
+        is_postgres = db.engine.dialect.name == "postgresql"
+        # The segment-leading indexes need the column on tables that predate it.
+        add_segment_columns()
+
+        # Work on copies so the models' own indexes (used by create_all) never
+        # pick up CONCURRENTLY.
+        scratch = MetaData()
+
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+        with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for model in MODELS:
+                table = model.__table__.to_metadata(scratch)
+                for index in sorted(table.indexes, key=lambda i: i.name):
+                    if is_postgres:
+                        index.dialect_options["postgresql"]["concurrently"] = True
+                    conn.execute(CreateIndex(index, if_not_exists=True))
+                    print(f"   - {table.name}.{index.name}")
+
+            for name in REPLACED_INDEXES:
+                conn.execute(text(f"DROP INDEX {'CONCURRENTLY ' if is_postgres else ''}IF EXISTS {name}"))
+
+            if is_postgres:
+                for model in MODELS:
+                    conn.execute(text(f"ANALYZE {model.__tablename__}"))
+
+        print("✅ Índices criados com sucesso!")
+
+
+if __name__ == "__main__":
+    migrate_indexes()
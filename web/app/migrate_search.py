@@ -0,0 +1,46 @@
+from sqlalchemy import inspect, text
+from app import create_app
+from app.db import db
+from app.search import (
+    POSTGRES_SEARCH_COLUMN,
+    POSTGRES_SEARCH_INDEX,
+    POSTGRES_TRGM_EXTENSION,
+    POSTGRES_TRGM_INDEX,
+    ensure_search_index
+)
+
+
+def migrate_search():
+    app = create_app()
+    with app.app_context():
+        if db.engine.dialect.name != "postgresql":
+            with db.engine.begin() as conn:
+                ensure_search_index(conn)
+            print("✅ Índice de busca criado com sucesso!")
+            return
+
+        columns = {c["name"] for c in inspect(db.engine).get_columns("movies")}
+        if "search_vector" not in columns:
+            # Rewrites every row of movies while holding an ACCESS EXCLUSIVE
+            # lock: reads and writes on movies wait until it finishes.
+            print("   + movies.search_vector (reescreve a tabela movies)")
+            with db.engine.begin() as conn:
+                conn.execute(text(POSTGRES_SEARCH_COLUMN))
+
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+        with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text(POSTGRES_SEARCH_INDEX.format(concurrently="CONCURRENTLY ")))
+            print("   - movies.ix_movies_search_vector")
+            try:
+                conn.execute(text(POSTGRES_TRGM_EXTENSION))
+                conn.execute(text(POSTGRES_TRGM_INDEX.format(concurrently="CONCURRENTLY ")))
+                print("   - movies.ix_movies_title_trgm")
+            except Exception as e:
+                print(f"⚠️ pg_trgm indisponível, busca sem tolerância a erros de digitação: {e}")
+            conn.execute(text("ANALYZE movies"))
+
+        print("✅ Índice de busca criado com sucesso!")
+
+
+if __name__ == "__main__":
+    migrate_search()
@@ -1,24 +1,34 @@
 import pandas as pd
 import numpy as np
 import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
+from multiprocessing import shared_memory
 from flask import current_app
-from .db import db
+from sqlalchemy import insert
+from .db import db, replica_reads
+from .metrics import PhaseTimer, TRAINING_PHASE_SECONDS, observe
 from .models import (
-    Movie, 
-    HorrorRegression, 
+    Movie,
+    HorrorRegression,
     HorrorRegressionPrediction,
     HorrorClassification,
     HorrorClustering,
-    HorrorClusterProfile
+    HorrorClusterProfile,
+    HorrorSimilarityIndex
 )
+from .segments import DEFAULT_SEGMENT, genre_name, parse_segments
+from .similarity import build_similarity_row
 from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import (
-    mean_absolute_error, 
-    r2_score, 
-    confusion_matrix, 
-    roc_curve, 
+    mean_absolute_error,
+    r2_score,
+    confusion_matrix,
+    roc_curve,
     roc_auc_score,
     accuracy_score
 )
@@ -26,300 +36,425 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.cluster import KMeans
 from sklearn.decomposition import PCA
 
+MODELS = ("regression", "classification", "clustering")
+MIN_SEGMENT_MOVIES = 20
 
-def get_horror_movies():
-    movies = db.session.query(Movie).filter(
-        Movie.genres.isnot(None),
-        Movie.popularity.isnot(None),
-        Movie.vote_average.isnot(None)
-    ).all()
-    
-    horror_movies = [m for m in movies if m.genres and 'Horror' in m.genres]
-    return horror_movies
+CATALOG_COLUMNS = (
+    Movie.tmdb_id,
+    Movie.title,
+    Movie.runtime,
+    Movie.vote_count,
+    Movie.release_date,
+    Movie.genres,
+    Movie.language,
+    Movie.popularity,
+    Movie.vote_average
+)
+NON_FEATURE_COLUMNS = ['tmdb_id', 'title', 'popularity', 'vote_average']
 
 
-def extract_horror_features(movies_df):
-    features = []
-    for _, row in movies_df.iterrows():
-        feat = {}
-        feat['tmdb_id'] = row['tmdb_id']
-        feat['runtime'] = row['runtime'] if pd.notna(row['runtime']) and row['runtime'] > 0 else 90
-        feat['vote_count'] = row['vote_count'] if pd.notna(row['vote_count']) else 0
-        
-        if pd.notna(row['release_date']):
-            try:
-                release = pd.to_datetime(row['release_date'])
-                feat['release_year'] = release.year
-                feat['release_month'] = release.month
-                feat['release_decade'] = (release.year // 10) * 10
-                feat['is_october'] = 1 if release.month == 10 else 0
-                feat['is_summer'] = 1 if release.month in [6, 7, 8] else 0
-                feat['is_holiday'] = 1 if release.month in [11, 12] else 0
-            except:
-                feat['release_year'] = 2000
-                feat['release_month'] = 1
-                feat['release_decade'] = 2000
-                feat['is_october'] = 0
-                feat['is_summer'] = 0
-                feat['is_holiday'] = 0
-        else:
-            feat['release_year'] = 2000
-            feat['release_month'] = 1
-            feat['release_decade'] = 2000
-            feat['is_october'] = 0
-            feat['is_summer'] = 0
-            feat['is_holiday'] = 0
-        
-        genres = row['genres'] if pd.notna(row['genres']) else ""
-        genre_list = genres.split(',') if genres else []
-        feat['genre_count'] = len(genre_list)
-        feat['genre_thriller'] = 1 if 'Thriller' in genre_list else 0
-        feat['genre_mystery'] = 1 if 'Mystery' in genre_list else 0
-        feat['genre_scifi'] = 1 if 'Science Fiction' in genre_list else 0
-        feat['genre_fantasy'] = 1 if 'Fantasy' in genre_list else 0
-        
-        feat['is_english'] = 1 if row['language'] == 'en' else 0
-        
-        features.append(feat)
-    
-    return pd.DataFrame(features)
+def get_catalog():
+    # A few seconds of replica lag do not matter for an hourly retrain.
+    with replica_reads():
+        rows = db.session.query(*CATALOG_COLUMNS).filter(
+            Movie.genres.isnot(None),
+            Movie.popularity.isnot(None),
+            Movie.vote_average.isnot(None)
+        ).all()
 
+    return pd.DataFrame(rows, columns=[c.key for c in CATALOG_COLUMNS])
 
-def train_horror_regression():
-    horror_movies = get_horror_movies()
-    
-    if len(horror_movies) < 20:
-        return {"trained": False, "reason": "insufficient horror movies"}
-    
-    movies_df = pd.DataFrame([{
-        'tmdb_id': m.tmdb_id,
-        'runtime': m.runtime,
-        'vote_count': m.vote_count,
-        'release_date': m.release_date,
-        'genres': m.genres,
-        'language': m.language,
-        'popularity': m.popularity,
-        'vote_average': m.vote_average
-    } for m in horror_movies])
-    
-    features_df = extract_horror_features(movies_df)
-    features_df = features_df.merge(movies_df[['tmdb_id', 'popularity', 'vote_average']], on='tmdb_id')
-    
-    X = features_df.drop(['tmdb_id', 'popularity', 'vote_average'], axis=1)
+
+def _has_genre(genres, name):
+    return (',' + genres.fillna('') + ',').str.contains(f',{name},', regex=False)
+
+
+def extract_features(movies_df):
+    runtime = pd.to_numeric(movies_df['runtime'])
+    release = pd.to_datetime(movies_df['release_date'], errors='coerce')
+    month = release.dt.month
+    genres = movies_df['genres'].fillna('')
+
+    return pd.DataFrame({
+        'tmdb_id': movies_df['tmdb_id'],
+        'runtime': runtime.where(runtime > 0, 90),
+        'vote_count': pd.to_numeric(movies_df['vote_count']).fillna(0),
+        'release_year': release.dt.year.fillna(2000).astype(int),
+        'release_month': month.fillna(1).astype(int),
+        'release_decade': (release.dt.year // 10 * 10).fillna(2000).astype(int),
+        'is_october': (month == 10).astype(int),
+        'is_summer': month.isin([6, 7, 8]).astype(int),
+        'is_holiday': month.isin([11, 12]).astype(int),
+        'genre_count': (genres.str.count(',') + 1).where(genres != '', 0),
+        'genre_thriller': _has_genre(genres, 'Thriller').astype(int),
+        'genre_mystery': _has_genre(genres, 'Mystery').astype(int),
+        'genre_scifi': _has_genre(genres, 'Science Fiction').astype(int),
+        'genre_fantasy': _has_genre(genres, 'Fantasy').astype(int),
+        'is_english': (movies_df['language'] == 'en').astype(int)
+    })
+
+
+def featurize_catalog(movies_df):
+    features_df = extract_features(movies_df)
+    features_df['title'] = movies_df['title']
+    features_df['popularity'] = movies_df['popularity']
+    features_df['vote_average'] = movies_df['vote_average']
+    return features_df
+
+
+def segment_mask(movies_df, segment):
+    return _has_genre(movies_df['genres'], genre_name(segment)).to_numpy()
+
+
+def fit_regression(features_df):
+    X = features_df.drop(NON_FEATURE_COLUMNS, axis=1)
     y_popularity = features_df['popularity']
-    
+
     X_train, X_test, y_train, y_test = train_test_split(X, y_popularity, test_size=0.25, random_state=42)
-    
+
     scaler = StandardScaler()
     X_train_scaled = scaler.fit_transform(X_train)
     X_test_scaled = scaler.transform(X_test)
-    
+
     model = RandomForestRegressor(n_estimators=100, max_depth=10, random_state=42)
     model.fit(X_train_scaled, y_train)
-    
+
     y_pred = model.predict(X_test_scaled)
-    mae = mean_absolute_error(y_test, y_pred)
-    r2 = r2_score(y_test, y_pred)
-    
-    feature_importances = model.feature_importances_
-    feature_names = X.columns.tolist()
-    
-    X_all_scaled = scaler.transform(X)
-    y_pred_all = model.predict(X_all_scaled)
-    
-    analysis_ts = datetime.utcnow()
-    
-    db.session.query(HorrorRegression).delete()
-    db.session.query(HorrorRegressionPrediction).delete()
-    
-    for feat_name, importance in zip(feature_names, feature_importances):
-        hr = HorrorRegression(
-            analysis_ts=analysis_ts,
-            feature_name=feat_name,
-            feature_importance=float(importance),
-            mae=float(mae),
-            r2_score=float(r2)
-        )
-        db.session.add(hr)
-    
-    for idx, tmdb_id in enumerate(features_df['tmdb_id']):
-        hrp = HorrorRegressionPrediction(
-            analysis_ts=analysis_ts,
-            tmdb_id=int(tmdb_id),
-            actual_popularity=float(features_df.iloc[idx]['popularity']),
-            predicted_popularity=float(y_pred_all[idx])
-        )
-        db.session.add(hrp)
-    
-    db.session.commit()
-    
+
     return {
-        "trained": True,
-        "samples": len(X),
-        "mae": float(mae),
-        "r2": float(r2)
+        "feature_names": X.columns.tolist(),
+        "feature_importances": model.feature_importances_,
+        "mae": float(mean_absolute_error(y_test, y_pred)),
+        "r2": float(r2_score(y_test, y_pred)),
+        "tmdb_ids": features_df['tmdb_id'].to_numpy(),
+        "actual": y_popularity.to_numpy(),
+        "predicted": model.predict(scaler.transform(X))
     }
 
 
-def train_horror_classification():
-    horror_movies = get_horror_movies()
-    
-    if len(horror_movies) < 20:
-        return {"trained": False, "reason": "insufficient horror movies"}
-    
-    movies_df = pd.DataFrame([{
-        'tmdb_id': m.tmdb_id,
-        'runtime': m.runtime,
-        'vote_count': m.vote_count,
-        'release_date': m.release_date,
-        'genres': m.genres,
-        'language': m.language,
-        'popularity': m.popularity,
-        'vote_average': m.vote_average
-    } for m in horror_movies])
-    
-    features_df = extract_horror_features(movies_df)
-    features_df = features_df.merge(movies_df[['tmdb_id', 'popularity', 'vote_average']], on='tmdb_id')
-    
+def fit_classification(features_df):
     threshold = features_df['vote_average'].median()
-    features_df['high_rating'] = (features_df['vote_average'] > threshold).astype(int)
-    
-    X = features_df.drop(['tmdb_id', 'popularity', 'vote_average', 'high_rating'], axis=1)
-    y = features_df['high_rating']
-    
+    y = (features_df['vote_average'] > threshold).astype(int)
+    X = features_df.drop(NON_FEATURE_COLUMNS, axis=1)
+
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.25, random_state=42, stratify=y)
-    
+
     scaler = StandardScaler()
     X_train_scaled = scaler.fit_transform(X_train)
     X_test_scaled = scaler.transform(X_test)
-    
+
     model = RandomForestClassifier(n_estimators=100, max_depth=10, random_state=42)
     model.fit(X_train_scaled, y_train)
-    
+
     y_pred = model.predict(X_test_scaled)
     y_pred_proba = model.predict_proba(X_test_scaled)[:, 1]
-    
-    cm = confusion_matrix(y_test, y_pred)
-    accuracy = accuracy_score(y_test, y_pred)
-    
+
     fpr, tpr, thresholds = roc_curve(y_test, y_pred_proba)
-    auc = roc_auc_score(y_test, y_pred_proba)
-    
-    analysis_ts = datetime.utcnow()
-    
-    db.session.query(HorrorClassification).delete()
-    
-    hc = HorrorClassification(
-        analysis_ts=analysis_ts,
-        confusion_matrix=json.dumps(cm.tolist()),
-        roc_curve=json.dumps({
-            'fpr': fpr.tolist(),
-            'tpr': tpr.tolist()
-        }),
-        auc_score=float(auc),
-        accuracy=float(accuracy)
-    )
-    db.session.add(hc)
-    db.session.commit()
-    
+
     return {
-        "trained": True,
         "samples": len(X),
-        "accuracy": float(accuracy),
-        "auc": float(auc)
+        "confusion_matrix": confusion_matrix(y_test, y_pred).tolist(),
+        "fpr": fpr.tolist(),
+        "tpr": tpr.tolist(),
+        "auc": float(roc_auc_score(y_test, y_pred_proba)),
+        "accuracy": float(accuracy_score(y_test, y_pred))
     }
 
 
-def train_horror_clustering():
-    horror_movies = get_horror_movies()
-    
-    if len(horror_movies) < 20:
-        return {"trained": False, "reason": "insufficient horror movies"}
-    
-    movies_df = pd.DataFrame([{
-        'tmdb_id': m.tmdb_id,
-        'runtime': m.runtime,
-        'vote_count': m.vote_count,
-        'release_date': m.release_date,
-        'genres': m.genres,
-        'language': m.language,
-        'popularity': m.popularity,
-        'vote_average': m.vote_average
-    } for m in horror_movies])
-    
-    features_df = extract_horror_features(movies_df)
-    features_df = features_df.merge(movies_df[['tmdb_id', 'popularity', 'vote_average']], on='tmdb_id')
-    
-    X = features_df.drop(['tmdb_id', 'popularity', 'vote_average'], axis=1)
-    
+def fit_clustering(features_df):
+    X = features_df.drop(NON_FEATURE_COLUMNS, axis=1)
+
     scaler = StandardScaler()
     X_scaled = scaler.fit_transform(X)
-    
+
     n_clusters = min(4, len(X) // 10)
     if n_clusters < 2:
         n_clusters = 2
-    
+
     kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
     clusters = kmeans.fit_predict(X_scaled)
-    
+
     pca = PCA(n_components=2, random_state=42)
     X_pca = pca.fit_transform(X_scaled)
-    
-    analysis_ts = datetime.utcnow()
-    
-    db.session.query(HorrorClustering).delete()
-    db.session.query(HorrorClusterProfile).delete()
-    
-    for idx, tmdb_id in enumerate(features_df['tmdb_id']):
-        hc = HorrorClustering(
-            analysis_ts=analysis_ts,
-            tmdb_id=int(tmdb_id),
-            cluster_id=int(clusters[idx]),
-            pca_x=float(X_pca[idx, 0]),
-            pca_y=float(X_pca[idx, 1])
-        )
-        db.session.add(hc)
-    
+
+    profiles = []
     for cluster_id in range(n_clusters):
-        cluster_mask = clusters == cluster_id
-        cluster_data = features_df[cluster_mask]
-        
-        hcp = HorrorClusterProfile(
-            analysis_ts=analysis_ts,
-            cluster_id=int(cluster_id),
-            avg_popularity=float(cluster_data['popularity'].mean()),
-            avg_vote_average=float(cluster_data['vote_average'].mean()),
-            avg_runtime=float(cluster_data['runtime'].mean()),
-            avg_vote_count=float(cluster_data['vote_count'].mean()),
-            movie_count=int(len(cluster_data))
-        )
-        db.session.add(hcp)
-    
+        cluster_data = features_df[clusters == cluster_id]
+        profiles.append({
+            "cluster_id": cluster_id,
+            "avg_popularity": float(cluster_data['popularity'].mean()),
+            "avg_vote_average": float(cluster_data['vote_average'].mean()),
+            "avg_runtime": float(cluster_data['runtime'].mean()),
+            "avg_vote_count": float(cluster_data['vote_count'].mean()),
+            "movie_count": int(len(cluster_data))
+        })
+
+    return {
+        "n_clusters": n_clusters,
+        "feature_names": X.columns.tolist(),
+        "tmdb_ids": features_df['tmdb_id'].to_numpy(),
+        "titles": features_df['title'].tolist(),
+        "clusters": clusters,
+        "pca": X_pca,
+        "features": X_scaled,
+        "profiles": profiles
+    }
+
+
+def persist_regression(segment, fitted, analysis_ts):
+    db.session.query(HorrorRegression).filter(HorrorRegression.segment == segment).delete()
+    db.session.query(HorrorRegressionPrediction).filter(HorrorRegressionPrediction.segment == segment).delete()
+
+    db.session.execute(insert(HorrorRegression), [
+        {
+            "segment": segment,
+            "analysis_ts": analysis_ts,
+            "feature_name": name,
+            "feature_importance": float(importance),
+            "mae": fitted["mae"],
+            "r2_score": fitted["r2"]
+        } for name, importance in zip(fitted["feature_names"], fitted["feature_importances"])
+    ])
+    db.session.execute(insert(HorrorRegressionPrediction), [
+        {
+            "segment": segment,
+            "analysis_ts": analysis_ts,
+            "tmdb_id": int(tmdb_id),
+            "actual_popularity": float(actual),
+            "predicted_popularity": float(predicted)
+        } for tmdb_id, actual, predicted in zip(fitted["tmdb_ids"], fitted["actual"], fitted["predicted"])
+    ])
     db.session.commit()
-    
+
     return {
         "trained": True,
-        "samples": len(X),
-        "n_clusters": n_clusters
+        "samples": len(fitted["tmdb_ids"]),
+        "mae": fitted["mae"],
+        "r2": fitted["r2"]
     }
 
 
-def train_all_horror_models():
-    results = {}
-    
+def persist_classification(segment, fitted, analysis_ts):
+    db.session.query(HorrorClassification).filter(HorrorClassification.segment == segment).delete()
+
+    db.session.add(HorrorClassification(
+        segment=segment,
+        analysis_ts=analysis_ts,
+        confusion_matrix=json.dumps(fitted["confusion_matrix"]),
+        roc_curve=json.dumps({
+            'fpr': fitted["fpr"],
+            'tpr': fitted["tpr"]
+        }),
+        auc_score=fitted["auc"],
+        accuracy=fitted["accuracy"]
+    ))
+    db.session.commit()
+
+    return {
+        "trained": True,
+        "samples": fitted["samples"],
+        "accuracy": fitted["accuracy"],
+        "auc": fitted["auc"]
+    }
+
+
+def persist_clustering(segment, fitted, analysis_ts):
+    for model in (HorrorClustering, HorrorClusterProfile, HorrorSimilarityIndex):
+        db.session.query(model).filter(model.segment == segment).delete()
+
+    db.session.add(build_similarity_row(
+        segment,
+        analysis_ts,
+        fitted["tmdb_ids"],
+        fitted["titles"],
+        fitted["features"],
+        fitted["feature_names"]
+    ))
+    db.session.execute(insert(HorrorClustering), [
+        {
+            "segment": segment,
+            "analysis_ts": analysis_ts,
+            "tmdb_id": int(tmdb_id),
+            "cluster_id": int(cluster_id),
+            "pca_x": float(x),
+            "pca_y": float(y)
+        } for tmdb_id, cluster_id, (x, y) in zip(fitted["tmdb_ids"], fitted["clusters"], fitted["pca"])
+    ])
+    db.session.execute(insert(HorrorClusterProfile), [
+        {"segment": segment, "analysis_ts": analysis_ts, **profile} for profile in fitted["profiles"]
+    ])
+    db.session.commit()
+
+    return {
+        "trained": True,
+        "samples": len(fitted["tmdb_ids"]),
+        "n_clusters": fitted["n_clusters"]
+    }
+
+
+FITTERS = {
+    "regression": fit_regression,
+    "classification": fit_classification,
+    "clustering": fit_clustering
+}
+
+PERSISTERS = {
+    "regression": persist_regression,
+    "classification": persist_classification,
+    "clustering": persist_clustering
+}
+
+def _init_fit_worker():
+    from threadpoolctl import threadpool_limits
+
+    # The pool already uses every core, so keep BLAS/OpenMP single-threaded.
+    threadpool_limits(1)
+
+
+def _share_features(features_df):
+    numeric = features_df.drop(columns=['title'])
+    block = shared_memory.SharedMemory(create=True, size=max(numeric.size, 1) * 8)
+    np.ndarray(numeric.shape, dtype=np.float64, buffer=block.buf)[:] = numeric.to_numpy(dtype=np.float64)
+    return block, (block.name, numeric.shape, numeric.columns.tolist())
+
+
+_attached = {}
+
+
+def _fit_shared(spec, rows, titles, model):
+    start = time.perf_counter()
     try:
-        results['regression'] = train_horror_regression()
+        name, shape, columns = spec
+        if name not in _attached:
+            _attached[name] = shared_memory.SharedMemory(name=name)
+        features = np.ndarray(shape, dtype=np.float64, buffer=_attached[name].buf)
+        features_df = pd.DataFrame(features[rows], columns=columns)
+        features_df['tmdb_id'] = features_df['tmdb_id'].astype(np.int64)
+        # Titles are only used by clustering (for the similarity index).
+        features_df['title'] = titles if titles is not None else ''
+        return FITTERS[model](features_df), None, time.perf_counter() - start
     except Exception as e:
-        results['regression'] = {"trained": False, "error": str(e)}
-    
+        return None, str(e), time.perf_counter() - start
+
+
+def _fit(features_df, mask, model):
+    start = time.perf_counter()
     try:
-        results['classification'] = train_horror_classification()
+        return FITTERS[model](features_df[mask].reset_index(drop=True)), None, time.perf_counter() - start
     except Exception as e:
-        results['classification'] = {"trained": False, "error": str(e)}
-    
+        return None, str(e), time.perf_counter() - start
+
+
+def _fit_all(features_df, masks, jobs, processes):
+    # Celery prefork children are daemonic and cannot start a pool of their
+    # own; there (and for a single job) the fits run one after another.
+    if processes <= 1 or len(jobs) <= 1 or multiprocessing.current_process().daemon:
+        for segment, model in jobs:
+            yield (segment, model, *_fit(features_df, masks[segment], model))
+        return
+
+    # The worker process has live threads (lease renewal, metrics flushing)
+    # and pooled Redis/database connections, so the pool never forks it:
+    # children start from a fresh interpreter and read the featurized
+    # catalog from shared memory instead of receiving a pickled copy.
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    context = multiprocessing.get_context(method)
+    if method == "forkserver":
+        context.set_forkserver_preload([__name__])
+
+    block, spec = _share_features(features_df)
     try:
-        results['clustering'] = train_horror_clustering()
-    except Exception as e:
-        results['clustering'] = {"trained": False, "error": str(e)}
-    
+        with ProcessPoolExecutor(
+            max_workers=min(processes, len(jobs)),
+            mp_context=context,
+            initializer=_init_fit_worker
+        ) as pool:
+            futures = {}
+            for segment, model in jobs:
+                mask = masks[segment]
+                titles = features_df['title'][mask].tolist() if model == "clustering" else None
+                futures[pool.submit(_fit_shared, spec, np.flatnonzero(mask), titles, model)] = (segment, model)
+            for future in as_completed(futures):
+                segment, model = futures[future]
+                try:
+                    yield (segment, model, *future.result())
+                except Exception as e:
+                    yield segment, model, None, str(e), 0.0
+    finally:
+        block.close()
+        block.unlink()
+
+
+def train_segments(segments=None, models=MODELS, processes=None):
+    segments = segments or parse_segments(current_app.config["TRAIN_SEGMENTS"])
+    processes = processes or current_app.config.get("TRAIN_PROCESSES") or os.cpu_count() or 1
+
+    timer = PhaseTimer("all", "catalog")
+    movies_df = get_catalog()
+    timer.mark("load")
+    features_df = featurize_catalog(movies_df)
+    timer.mark("featurize")
+
+    masks = {segment: segment_mask(movies_df, segment) for segment in segments}
+    results = {segment: {} for segment in segments}
+    jobs = []
+    # Largest segments first, so the last jobs to start are the short ones.
+    for segment in sorted(segments, key=lambda s: -masks[s].sum()):
+        if masks[segment].sum() < MIN_SEGMENT_MOVIES:
+            for model in models:
+                results[segment][model] = {"trained": False, "reason": f"insufficient {segment} movies"}
+        else:
+            jobs.extend((segment, model) for model in models)
+
+    # Results are persisted here, in the parent, while the pool keeps
+    # fitting the remaining jobs.
+    for segment, model, fitted, error, seconds in _fit_all(features_df, masks, jobs, processes):
+        observe(TRAINING_PHASE_SECONDS, (segment, model, "fit"), seconds)
+        if error is not None:
+            results[segment][model] = {"trained": False, "error": error}
+            continue
+
+        timer = PhaseTimer(segment, model)
+        try:
+            results[segment][model] = PERSISTERS[model](segment, fitted, datetime.utcnow())
+        except Exception as e:
+            db.session.rollback()
+            results[segment][model] = {"trained": False, "error": str(e)}
+        timer.mark("persist")
+
     return results
+
+
+# Horror-only entry points from before segments, kept for existing callers.
+def get_horror_movies():
+    movies = db.session.query(Movie).filter(
+        Movie.genres.isnot(None),
+        Movie.popularity.isnot(None),
+        Movie.vote_average.isnot(None)
+    ).all()
+    return [m for m in movies if genre_name(DEFAULT_SEGMENT) in m.genres.split(',')]
+
+
+def movies_frame(movies):
+    columns = [c.key for c in CATALOG_COLUMNS]
+    return pd.DataFrame([{c: getattr(m, c) for c in columns} for m in movies], columns=columns)
+
+
+def extract_horror_features(movies_df):
+    return extract_features(movies_df)
+
+
+def train_horror_regression():
+    return train_segments([DEFAULT_SEGMENT], models=("regression",), processes=1)[DEFAULT_SEGMENT]["regression"]
+
+
+def train_horror_classification():
+    return train_segments([DEFAULT_SEGMENT], models=("classification",), processes=1)[DEFAULT_SEGMENT]["classification"]
+
+
+def train_horror_clustering():
+    return train_segments([DEFAULT_SEGMENT], models=("clustering",), processes=1)[DEFAULT_SEGMENT]["clustering"]
+
+
+def train_all_horror_models():
+    return train_segments([DEFAULT_SEGMENT])[DEFAULT_SEGMENT]
@@ -4,6 +4,9 @@ from datetime import datetime
 
 class Movie(db.Model):
     __tablename__ = "movies"
+    __table_args__ = (
+        db.Index("ix_movies_updated_at", "updated_at"),
+    )
     tmdb_id = db.Column(db.BigInteger, primary_key=True)
     imdb_id = db.Column(db.String(32))
     title = db.Column(db.String(512), nullable=False)
@@ -24,6 +27,9 @@ class Movie(db.Model):
 
 class Snapshot(db.Model):
     __tablename__ = "movie_snapshots"
+    __table_args__ = (
+        db.Index("ix_movie_snapshots_tmdb_id_snapshot_ts", "tmdb_id", "snapshot_ts"),
+    )
     id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
     tmdb_id = db.Column(db.BigInteger, db.ForeignKey("movies.tmdb_id"))
     snapshot_ts = db.Column(db.DateTime, nullable=False)
@@ -48,7 +54,14 @@ class ModelPrediction(db.Model):
 
 class HorrorRegression(db.Model):
     __tablename__ = "horror_regression"
+    __table_args__ = (
+        db.Index(
+            "ix_horror_regression_seg_ts_importance", "segment", "analysis_ts", "feature_importance",
+            postgresql_include=["feature_name", "mae", "r2_score"]
+        ),
+    )
     id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+    segment = db.Column(db.String(32), nullable=False, default="horror", server_default="horror")
     analysis_ts = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     feature_name = db.Column(db.String(128))
     feature_importance = db.Column(db.Float)
@@ -58,7 +71,15 @@ class HorrorRegression(db.Model):
 
 class HorrorRegressionPrediction(db.Model):
     __tablename__ = "horror_regression_predictions"
+    __table_args__ = (
+        db.Index(
+            "ix_horror_regression_predictions_seg_ts_id", "segment", "analysis_ts", "id",
+            postgresql_include=["tmdb_id", "actual_popularity", "predicted_popularity"]
+        ),
+        db.Index("ix_horror_regression_predictions_tmdb_id", "tmdb_id"),
+    )
     id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+    segment = db.Column(db.String(32), nullable=False, default="horror", server_default="horror")
     analysis_ts = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     tmdb_id = db.Column(db.BigInteger, db.ForeignKey("movies.tmdb_id"))
     actual_popularity = db.Column(db.Float)
@@ -67,7 +88,11 @@ class HorrorRegressionPrediction(db.Model):
 
 class HorrorClassification(db.Model):
     __tablename__ = "horror_classification"
+    __table_args__ = (
+        db.Index("ix_horror_classification_seg_ts", "segment", "analysis_ts"),
+    )
     id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+    segment = db.Column(db.String(32), nullable=False, default="horror", server_default="horror")
     analysis_ts = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     confusion_matrix = db.Column(db.Text)
     roc_curve = db.Column(db.Text)
@@ -77,7 +102,15 @@ class HorrorClassification(db.Model):
 
 class HorrorClustering(db.Model):
     __tablename__ = "horror_clustering"
+    __table_args__ = (
+        db.Index(
+            "ix_horror_clustering_seg_ts_id", "segment", "analysis_ts", "id",
+            postgresql_include=["tmdb_id", "cluster_id", "pca_x", "pca_y"]
+        ),
+        db.Index("ix_horror_clustering_tmdb_id", "tmdb_id"),
+    )
     id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+    segment = db.Column(db.String(32), nullable=False, default="horror", server_default="horror")
     analysis_ts = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     tmdb_id = db.Column(db.BigInteger, db.ForeignKey("movies.tmdb_id"))
     cluster_id = db.Column(db.Integer)
@@ -87,7 +120,11 @@ class HorrorClustering(db.Model):
 
 class HorrorClusterProfile(db.Model):
     __tablename__ = "horror_cluster_profiles"
+    __table_args__ = (
+        db.Index("ix_horror_cluster_profiles_seg_ts_cluster", "segment", "analysis_ts", "cluster_id"),
+    )
     id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+    segment = db.Column(db.String(32), nullable=False, default="horror", server_default="horror")
     analysis_ts = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     cluster_id = db.Column(db.Integer)
     avg_popularity = db.Column(db.Float)
@@ -96,3 +133,18 @@ class HorrorClusterProfile(db.Model):
     avg_vote_count = db.Column(db.Float)
     movie_count = db.Column(db.Integer)
 
+
+
+class HorrorSimilarityIndex(db.Model):
+    __tablename__ = "horror_similarity_index"
+    __table_args__ = (
+        db.Index("ix_horror_similarity_index_seg_ts", "segment", "analysis_ts"),
+    )
+    id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+    segment = db.Column(db.String(32), nullable=False, default="horror", server_default="horror")
+    analysis_ts = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    movie_count = db.Column(db.Integer)
+    feature_names = db.Column(db.Text)
+    titles = db.Column(db.Text)
+    tmdb_ids = db.Column(db.LargeBinary)
+    features = db.Column(db.LargeBinary)
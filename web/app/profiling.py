@@ -0,0 +1,214 @@
+import argparse
+import contextvars
+import cProfile
+import functools
+import inspect
+import io
+import json
+import logging
+import os
+import pstats
+import shutil
+import time
+import uuid
+from datetime import datetime
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+ARTIFACT_HEADER = "X-Profile-Artifact"
+
+_current = contextvars.ContextVar("profile_session", default=None)
+
+
+def _targets():
+    return {t.strip() for t in Config.PROFILE_TARGETS.split(",") if t.strip()}
+
+
+# Read once: the disabled path of every wrapper is a single set lookup.
+ENV_TARGETS = _targets()
+
+
+def enabled_for(target):
+    return target in ENV_TARGETS or "all" in ENV_TARGETS
+
+
+class ProfileSession:
+    def __init__(self, name, directory=None, max_artifacts=None, max_statements=None):
+        self.name = name
+        self.directory = directory or Config.PROFILE_DIR
+        self.max_artifacts = max_artifacts or Config.PROFILE_MAX_ARTIFACTS
+        self.max_statements = max_statements or Config.PROFILE_MAX_STATEMENTS
+        self.profiler = cProfile.Profile()
+        self.statements = []
+        self.dropped_statements = 0
+        self._token = None
+
+    def start(self):
+        self.started_at = datetime.utcnow()
+        self._start = time.perf_counter()
+        self._token = _current.set(self)
+        self.profiler.enable()
+        return self
+
+    def stop(self, **meta):
+        self.profiler.disable()
+        _current.reset(self._token)
+        elapsed = time.perf_counter() - self._start
+        try:
+            return self._save(elapsed, meta)
+        except OSError as e:
+            logger.warning(f"Failed to save profile for {self.name}: {e}")
+            return None
+
+    def record_statement(self, statement, seconds, executemany):
+        if len(self.statements) >= self.max_statements:
+            self.dropped_statements += 1
+            return
+        self.statements.append({
+            "ms": round(seconds * 1000, 3),
+            "executemany": executemany,
+            "statement": statement[:2000],
+        })
+
+    def _save(self, elapsed, meta):
+        artifact = f"{self.started_at:%Y%m%dT%H%M%S%f}-{self.name}-{uuid.uuid4().hex[:6]}"
+        path = os.path.join(self.directory, artifact)
+        os.makedirs(path)
+
+        self.profiler.dump_stats(os.path.join(path, "profile.pstats"))
+        summary = io.StringIO()
+        pstats.Stats(self.profiler, stream=summary).sort_stats("cumulative").print_stats(60)
+        with open(os.path.join(path, "profile.txt"), "w") as f:
+            f.write(summary.getvalue())
+
+        with open(os.path.join(path, "sql.jsonl"), "w") as f:
+            for s in self.statements:
+                f.write(json.dumps(s) + "\n")
+
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump({
+                "name": self.name,
+                "started_at": self.started_at.isoformat(),
+                "seconds": round(elapsed, 4),
+                "pid": os.getpid(),
+                "sql_statements": len(self.statements) + self.dropped_statements,
+                "sql_seconds": round(sum(s["ms"] for s in self.statements) / 1000, 4),
+                "sql_statements_dropped": self.dropped_statements,
+                **meta,
+            }, f, indent=2, default=str)
+
+        prune(self.directory, self.max_artifacts)
+        return artifact
+
+
+def prune(directory, keep):
+    # Artifact names start with their timestamp, so sorting is oldest first.
+    artifacts = sorted(d for d in os.listdir(directory) if os.path.isdir(os.path.join(directory, d)))
+    for old in artifacts[:max(0, len(artifacts) - keep)]:
+        shutil.rmtree(os.path.join(directory, old), ignore_errors=True)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("profile_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    session = _current.get()
+    starts = conn.info.get("profile_start")
+    if session is not None and starts:
+        session.record_statement(statement, time.perf_counter() - starts.pop(), executemany)
+
+
+def instrument_engine(engine):
+    from sqlalchemy import event
+
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def profiled_task(target):
+    # Goes between @celery.task and the task body; profile=True as a task
+    # kwarg profiles a single run without touching the environment.
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, profile=False, **kwargs):
+            if not (profile or enabled_for(target)) or _current.get() is not None:
+                return fn(*args, **kwargs)
+            session = ProfileSession(target).start()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                artifact = session.stop(kwargs=kwargs)
+                logger.info(f"Profile of {target} saved to {artifact}")
+
+        # Celery checks call arguments against the task's signature at enqueue
+        # time; expose the body's (through any inner wrappers) plus profile.
+        signature = inspect.signature(fn)
+        params = [p for p in signature.parameters.values() if p.kind != inspect.Parameter.VAR_KEYWORD]
+        params.append(inspect.Parameter("profile", inspect.Parameter.KEYWORD_ONLY, default=False))
+        params.extend(p for p in signature.parameters.values() if p.kind == inspect.Parameter.VAR_KEYWORD)
+        wrapper.__signature__ = signature.replace(parameters=params)
+        return wrapper
+    return decorator
+
+
+def init_blueprint(bp, target="api", path_prefix="/api/horror/"):
+    from flask import current_app, g, request
+
+    @bp.before_request
+    def start_profile():
+        if not request.path.startswith(path_prefix):
+            return
+        token = current_app.config.get("PROFILE_TOKEN")
+        requested = token and request.headers.get(PROFILE_HEADER) == token
+        if requested or enabled_for(target):
+            g.profile_session = ProfileSession(f"{target}-{request.endpoint.rsplit('.', 1)[-1]}").start()
+
+    @bp.after_request
+    def stop_profile(response):
+        session = g.pop("profile_session", None)
+        if session is not None:
+            artifact = session.stop(path=request.full_path, status=response.status_code)
+            if artifact:
+                response.headers[ARTIFACT_HEADER] = artifact
+        return response
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List or show saved profiles and SQL logs.")
+    parser.add_argument("artifact", nargs="?", help="Artifact to show (default: list all)")
+    parser.add_argument("--dir", default=Config.PROFILE_DIR)
+    parser.add_argument("--top", type=int, default=25, help="Functions and SQL statements to show")
+    parser.add_argument("--sort", default="cumulative", help="pstats sort key, e.g. cumulative, tottime")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.dir):
+        print(f"Nenhum profile em {args.dir}")
+        return
+
+    if args.artifact is None:
+        for name in sorted(os.listdir(args.dir)):
+            meta_path = os.path.join(args.dir, name, "meta.json")
+            if os.path.exists(meta_path):
+                with open(meta_path) as f:
+                    meta = json.load(f)
+                print(f"{name}  {meta['seconds']:.3f}s  sql={meta['sql_statements']} ({meta['sql_seconds']:.3f}s)")
+        return
+
+    path = os.path.join(args.dir, args.artifact)
+    with open(os.path.join(path, "meta.json")) as f:
+        print(json.dumps(json.load(f), indent=2))
+    pstats.Stats(os.path.join(path, "profile.pstats")).sort_stats(args.sort).print_stats(args.top)
+    with open(os.path.join(path, "sql.jsonl")) as f:
+        statements = [json.loads(line) for line in f]
+    print(f"SQL mais lentos ({len(statements)} registrados):")
+    for s in sorted(statements, key=lambda s: -s["ms"])[:args.top]:
+        print(f"{s['ms']:10.3f}ms  {' '.join(s['statement'].split())[:160]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,14 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request, current_app
+import gzip
+import hashlib
 import json
 from sqlalchemy import text
 from ..db import db
+from ..profiling import init_blueprint as init_profiling
+from ..sampling import SAMPLE_MODES, paginate, stratified_sample, grid_bins
+from ..search import search_movies
+from ..segments import DEFAULT_SEGMENT, SEGMENTS, parse_segments
+from ..similarity import SimilarityIndexCache
 from ..models import (
     ModelPrediction, 
     Movie,
@@ -12,21 +19,268 @@ from ..models import (
     HorrorClusterProfile
 )
 
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
 api_bp = Blueprint("api", __name__)
+init_profiling(api_bp)
+
+COMPRESS_MIN_BYTES = 1024
+
+_similarity_caches = {}
+
+
+def _similarity_index(segment):
+    cache = _similarity_caches.get(segment)
+    if cache is None:
+        cache = _similarity_caches.setdefault(
+            segment, SimilarityIndexCache(segment, current_app.config["SIMILARITY_RECHECK_SECONDS"])
+        )
+    return cache.get()
+
+
+def _accepted_encodings():
+    encodings = set()
+    for part in request.headers.get("Accept-Encoding", "").split(","):
+        token, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        if token:
+            encodings.add(token.strip().lower())
+    return encodings
+
+
+def _compressed_json(payload):
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    encoding = None
+
+    if len(body) >= COMPRESS_MIN_BYTES:
+        accepted = _accepted_encodings()
+        if brotli is not None and "br" in accepted:
+            body = brotli.compress(body, quality=5)
+            encoding = "br"
+        elif "gzip" in accepted:
+            body = gzip.compress(body, compresslevel=6)
+            encoding = "gzip"
+
+    response = current_app.response_class(body, mimetype="application/json")
+    response.headers["Vary"] = "Accept-Encoding"
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def _latest_ts(model, segment):
+    return db.session.query(db.func.max(model.analysis_ts))\
+        .filter(model.segment == segment)\
+        .scalar_subquery()
+
+
+def _query_features(segment=DEFAULT_SEGMENT):
+    return db.session.query(
+        HorrorRegression.feature_name,
+        HorrorRegression.feature_importance,
+        HorrorRegression.mae,
+        HorrorRegression.r2_score
+    ).filter(
+        HorrorRegression.segment == segment,
+        HorrorRegression.analysis_ts == _latest_ts(HorrorRegression, segment)
+    )\
+        .order_by(HorrorRegression.feature_importance.desc())\
+        .all()
+
+
+# The scatter queries read only the results table; titles are joined onto the
+# rows a page or sample returns (see _with_titles), so a sample never joins
+# the whole run against movies.
+def _predictions_query(segment=DEFAULT_SEGMENT):
+    return db.session.query(
+        HorrorRegressionPrediction.id.label("id"),
+        HorrorRegressionPrediction.tmdb_id.label("tmdb_id"),
+        HorrorRegressionPrediction.actual_popularity.label("actual"),
+        HorrorRegressionPrediction.predicted_popularity.label("predicted")
+    ).filter(
+        HorrorRegressionPrediction.segment == segment,
+        HorrorRegressionPrediction.analysis_ts == _latest_ts(HorrorRegressionPrediction, segment)
+    )
+
+
+def _query_classification(segment=DEFAULT_SEGMENT):
+    return db.session.query(HorrorClassification)\
+        .filter(HorrorClassification.segment == segment)\
+        .order_by(HorrorClassification.analysis_ts.desc())\
+        .first()
+
+
+def _clusters_query(segment=DEFAULT_SEGMENT):
+    return db.session.query(
+        HorrorClustering.id.label("id"),
+        HorrorClustering.tmdb_id.label("tmdb_id"),
+        HorrorClustering.cluster_id.label("cluster_id"),
+        HorrorClustering.pca_x.label("pca_x"),
+        HorrorClustering.pca_y.label("pca_y")
+    ).filter(
+        HorrorClustering.segment == segment,
+        HorrorClustering.analysis_ts == _latest_ts(HorrorClustering, segment)
+    )
+
+
+def _with_titles(query):
+    subq = query.subquery()
+    return db.session.query(*subq.c, Movie.title.label("title"))\
+        .join(Movie, Movie.tmdb_id == subq.c.tmdb_id)\
+        .order_by(subq.c.id)
+
+
+def _query_profiles(segment=DEFAULT_SEGMENT):
+    return db.session.query(HorrorClusterProfile)\
+        .filter(
+            HorrorClusterProfile.segment == segment,
+            HorrorClusterProfile.analysis_ts == _latest_ts(HorrorClusterProfile, segment)
+        )\
+        .order_by(HorrorClusterProfile.cluster_id)\
+        .all()
+
+
+def _dashboard_versions(segment):
+    # One round trip for the latest analysis of every section; the dashboard
+    # payload only changes when one of these does.
+    row = db.session.query(
+        _latest_ts(HorrorRegression, segment),
+        _latest_ts(HorrorRegressionPrediction, segment),
+        _latest_ts(HorrorClassification, segment),
+        _latest_ts(HorrorClustering, segment),
+        _latest_ts(HorrorClusterProfile, segment)
+    ).one()
+    sections = ["features", "predictions", "classification", "clusters", "profiles"]
+    return {name: ts.isoformat() if ts else None for name, ts in zip(sections, row)}
+
+
+def _dashboard_etag(versions):
+    key = json.dumps([versions, sorted(request.args.items(multi=True))], separators=(",", ":"))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:20]
+
+
+def _metrics_from_features(features):
+    return {
+        "mae": features[0].mae if features else 0,
+        "r2_score": features[0].r2_score if features else 0
+    }
+
+
+def _classification_payload(latest):
+    if not latest:
+        return {"confusion_matrix": [], "roc_curve": {}, "metrics": {}}
+
+    return {
+        "confusion_matrix": json.loads(latest.confusion_matrix),
+        "roc_curve": json.loads(latest.roc_curve),
+        "metrics": {
+            "auc": latest.auc_score,
+            "accuracy": latest.accuracy
+        }
+    }
+
+
+def _columns(rows, names):
+    return {name: [row[i] for row in rows] for i, name in enumerate(names)}
+
+
+class ParamsError(ValueError):
+    pass
+
+
+class SegmentError(ValueError):
+    pass
+
+
+def _segment():
+    segment = request.args.get("segment", DEFAULT_SEGMENT)
+    if segment not in SEGMENTS:
+        raise SegmentError(f"segment must be one of: {', '.join(SEGMENTS)}")
+    return segment
+
+
+def _int_arg(name, default=None, minimum=None, maximum=None):
+    value = request.args.get(name)
+    if value is None:
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise ParamsError(f"{name} must be an integer")
+    if minimum is not None and value < minimum:
+        raise ParamsError(f"{name} must be at least {minimum}" if maximum is None
+                          else f"{name} must be between {minimum} and {maximum}")
+    if maximum is not None and value > maximum:
+        raise ParamsError(f"{name} must be at most {maximum}" if minimum is None
+                          else f"{name} must be between {minimum} and {maximum}")
+    return value
+
+
+def _scatter_params(default_sample=None):
+    limit = _int_arg("limit")
+    cursor = _int_arg("cursor")
+    sample = request.args.get("sample", default_sample)
+    budget = _int_arg("budget", current_app.config["SCATTER_POINT_BUDGET"])
+
+    if sample in ("", "none"):
+        sample = None
+    if sample is not None and sample not in SAMPLE_MODES:
+        raise ParamsError(f"sample must be one of: none, {', '.join(SAMPLE_MODES)}")
+    if limit is not None and not 0 < limit <= current_app.config["API_MAX_PAGE_SIZE"]:
+        raise ParamsError(f"limit must be between 1 and {current_app.config['API_MAX_PAGE_SIZE']}")
+    if budget <= 0:
+        raise ParamsError("budget must be positive")
+    if sample is not None and (limit is not None or cursor is not None):
+        raise ParamsError("sample cannot be combined with limit/cursor")
+
+    return limit, cursor, sample, min(budget, current_app.config["API_MAX_PAGE_SIZE"])
+
+
+def _scatter_rows(query, x_name, y_name, params, partition_by=None):
+    limit, cursor, sample, budget = params
+    meta = {"sample": sample}
+
+    if sample == "stratified":
+        rows, meta["total"] = stratified_sample(query, budget, partition_by=partition_by, decorate=_with_titles)
+    elif sample == "grid":
+        rows, meta["total"] = grid_bins(query, x_name, y_name, budget, group_by=partition_by)
+    elif limit is not None or cursor is not None:
+        rows, meta["next_cursor"] = paginate(
+            query, limit or current_app.config["API_MAX_PAGE_SIZE"], cursor, decorate=_with_titles
+        )
+    else:
+        rows = _with_titles(query).all()
+
+    return rows, meta
+
+
+def _scatter_columns(rows, names, meta):
+    if meta["sample"] == "grid":
+        names = [n for n in names if n != "title"] + ["count"]
+    return {name: [getattr(row, name) for row in rows] for name in names}
+
+
+@api_bp.errorhandler(ParamsError)
+def params_error(e):
+    return jsonify({"error": str(e)}), 400
+
+
+@api_bp.errorhandler(SegmentError)
+def segment_error(e):
+    return jsonify({"error": str(e)}), 400
 
 
 @api_bp.get("/horror/regression/features")
 def horror_regression_features():
-    latest_ts = db.session.query(db.func.max(HorrorRegression.analysis_ts)).scalar()
+    features = _query_features(_segment())
     
-    if not latest_ts:
+    if not features:
         return jsonify({"features": [], "metrics": {}})
     
-    features = db.session.query(HorrorRegression)\
-        .filter(HorrorRegression.analysis_ts == latest_ts)\
-        .order_by(HorrorRegression.feature_importance.desc())\
-        .all()
-    
     result = {
         "features": [
             {
@@ -34,10 +288,7 @@ def horror_regression_features():
                 "importance": f.feature_importance
             } for f in features
         ],
-        "metrics": {
-            "mae": features[0].mae if features else 0,
-            "r2_score": features[0].r2_score if features else 0
-        }
+        "metrics": _metrics_from_features(features)
     }
     
     return jsonify(result)
@@ -45,87 +296,64 @@ def horror_regression_features():
 
 @api_bp.get("/horror/regression/predictions")
 def horror_regression_predictions():
-    latest_ts = db.session.query(db.func.max(HorrorRegressionPrediction.analysis_ts)).scalar()
-    
-    if not latest_ts:
-        return jsonify({"predictions": []})
+    preds, meta = _scatter_rows(_predictions_query(_segment()), "actual", "predicted", _scatter_params())
     
-    preds = db.session.query(HorrorRegressionPrediction, Movie.title)\
-        .join(Movie, Movie.tmdb_id == HorrorRegressionPrediction.tmdb_id)\
-        .filter(HorrorRegressionPrediction.analysis_ts == latest_ts)\
-        .all()
-    
-    result = {
-        "predictions": [
+    if meta["sample"] == "grid":
+        points = [
             {
-                "title": title,
-                "actual": p.actual_popularity,
-                "predicted": p.predicted_popularity
-            } for p, title in preds
+                "actual": p.actual,
+                "predicted": p.predicted,
+                "count": p.count
+            } for p in preds
+        ]
+    else:
+        points = [
+            {
+                "title": p.title,
+                "actual": p.actual,
+                "predicted": p.predicted
+            } for p in preds
         ]
-    }
     
-    return jsonify(result)
+    return jsonify({"predictions": points, **meta})
 
 
 @api_bp.get("/horror/classification")
 def horror_classification():
-    latest = db.session.query(HorrorClassification)\
-        .order_by(HorrorClassification.analysis_ts.desc())\
-        .first()
-    
-    if not latest:
-        return jsonify({"confusion_matrix": [], "roc_curve": {}, "metrics": {}})
-    
-    result = {
-        "confusion_matrix": json.loads(latest.confusion_matrix),
-        "roc_curve": json.loads(latest.roc_curve),
-        "metrics": {
-            "auc": latest.auc_score,
-            "accuracy": latest.accuracy
-        }
-    }
-    
-    return jsonify(result)
+    return jsonify(_classification_payload(_query_classification(_segment())))
 
 
 @api_bp.get("/horror/clustering/pca")
 def horror_clustering_pca():
-    latest_ts = db.session.query(db.func.max(HorrorClustering.analysis_ts)).scalar()
+    clusters, meta = _scatter_rows(
+        _clusters_query(_segment()), "pca_x", "pca_y", _scatter_params(), partition_by="cluster_id"
+    )
     
-    if not latest_ts:
-        return jsonify({"clusters": []})
-    
-    clusters = db.session.query(HorrorClustering, Movie.title)\
-        .join(Movie, Movie.tmdb_id == HorrorClustering.tmdb_id)\
-        .filter(HorrorClustering.analysis_ts == latest_ts)\
-        .all()
-    
-    result = {
-        "clusters": [
+    if meta["sample"] == "grid":
+        points = [
             {
-                "title": title,
+                "cluster_id": c.cluster_id,
+                "pca_x": c.pca_x,
+                "pca_y": c.pca_y,
+                "count": c.count
+            } for c in clusters
+        ]
+    else:
+        points = [
+            {
+                "title": c.title,
                 "cluster_id": c.cluster_id,
                 "pca_x": c.pca_x,
                 "pca_y": c.pca_y
-            } for c, title in clusters
+            } for c in clusters
         ]
-    }
     
-    return jsonify(result)
+    return jsonify({"clusters": points, **meta})
 
 
 @api_bp.get("/horror/clustering/profiles")
 def horror_clustering_profiles():
-    latest_ts = db.session.query(db.func.max(HorrorClusterProfile.analysis_ts)).scalar()
-    
-    if not latest_ts:
-        return jsonify({"profiles": []})
-    
-    profiles = db.session.query(HorrorClusterProfile)\
-        .filter(HorrorClusterProfile.analysis_ts == latest_ts)\
-        .order_by(HorrorClusterProfile.cluster_id)\
-        .all()
+    profiles = _query_profiles(_segment())
     
     result = {
         "profiles": [
@@ -143,6 +371,119 @@ def horror_clustering_profiles():
     return jsonify(result)
 
 
+@api_bp.get("/horror/dashboard")
+def horror_dashboard():
+    segment = _segment()
+    params = _scatter_params(default_sample="stratified")
+    versions = _dashboard_versions(segment)
+    etag = _dashboard_etag(versions)
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+
+    features = _query_features(segment)
+    profiles = _query_profiles(segment)
+    preds, preds_meta = _scatter_rows(_predictions_query(segment), "actual", "predicted", params)
+    clusters, clusters_meta = _scatter_rows(
+        _clusters_query(segment), "pca_x", "pca_y", params, partition_by="cluster_id"
+    )
+    
+    result = {
+        "segment": segment,
+        "version": etag,
+        "versions": versions,
+        "features": {
+            "columns": _columns(features, ["name", "importance"]),
+            "metrics": _metrics_from_features(features) if features else {}
+        },
+        "predictions": {
+            "columns": _scatter_columns(preds, ["title", "actual", "predicted"], preds_meta),
+            **preds_meta
+        },
+        "classification": _classification_payload(_query_classification(segment)),
+        "clusters": {
+            "columns": _scatter_columns(clusters, ["title", "cluster_id", "pca_x", "pca_y"], clusters_meta),
+            **clusters_meta
+        },
+        "profiles": _columns(
+            [(
+                p.cluster_id,
+                p.avg_popularity,
+                p.avg_vote_average,
+                p.avg_runtime,
+                p.avg_vote_count,
+                p.movie_count
+            ) for p in profiles],
+            ["cluster_id", "avg_popularity", "avg_vote_average", "avg_runtime", "avg_vote_count", "movie_count"]
+        )
+    }
+    
+    response = _compressed_json(result)
+    response.set_etag(etag, weak=True)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+@api_bp.get("/horror/similar/<int:tmdb_id>")
+def horror_similar(tmdb_id):
+    k = _int_arg("k", 10, minimum=1, maximum=100)
+    
+    index = _similarity_index(_segment())
+    if index is None:
+        return jsonify({"tmdb_id": tmdb_id, "similar": []})
+    
+    similar = index.query(tmdb_id, k)
+    if similar is None:
+        return jsonify({"error": f"movie {tmdb_id} is not in the latest similarity index"}), 404
+    
+    return jsonify({
+        "tmdb_id": tmdb_id,
+        "analysis_ts": index.analysis_ts.isoformat(),
+        "similar": similar
+    })
+
+
+@api_bp.get("/segments")
+def segments():
+    return jsonify({"default": DEFAULT_SEGMENT, "trained": parse_segments(current_app.config["TRAIN_SEGMENTS"]), "known": list(SEGMENTS)})
+
+
+@api_bp.get("/movies/search")
+def movies_search():
+    q = request.args.get("q", "").strip()
+    autocomplete = request.args.get("autocomplete", "").lower() in ("1", "true", "yes")
+    limit = _int_arg("limit", 10 if autocomplete else 20, minimum=1, maximum=100)
+    offset = _int_arg("offset", 0, minimum=0)
+    
+    if len(q) < 2:
+        return jsonify({"error": "q must have at least 2 characters"}), 400
+    
+    rows = search_movies(
+        q,
+        limit=limit + 1,
+        offset=offset,
+        autocomplete=autocomplete,
+        candidates=current_app.config["SEARCH_CANDIDATE_LIMIT"]
+    )
+    
+    result = {
+        "results": [
+            {
+                "tmdb_id": r.tmdb_id,
+                "title": r.title,
+                "original_title": r.original_title,
+                "release_date": str(r.release_date) if r.release_date else None,
+                "popularity": r.popularity,
+                "rank": float(r.rank or 0)
+            } for r in rows[:limit]
+        ],
+        "next_offset": offset + limit if len(rows) > limit else None
+    }
+    
+    return jsonify(result)
+
+
 @api_bp.get("/health")
 def api_health():
     return {"ok": True}
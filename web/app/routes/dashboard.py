@@ -5,5 +5,9 @@ dash_bp = Blueprint("dash", __name__)
 
 @dash_bp.get("/")
 def index():
-    return render_template("index.html", poll_ms=current_app.config.get("POLL_INTERVAL_MS", 30000))
+    return render_template(
+        "index.html",
+        events_url=current_app.config["EVENTS_URL"],
+        fallback_refresh_ms=current_app.config["EVENTS_FALLBACK_REFRESH_MS"]
+    )
 
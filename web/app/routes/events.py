@@ -0,0 +1,33 @@
+from flask import Blueprint, Response, current_app
+from ..events import EventHub, stream_events
+
+events_bp = Blueprint("events", __name__)
+
+_hub = None
+
+
+def get_hub():
+    global _hub
+    if _hub is None:
+        _hub = EventHub(current_app.config["REDIS_URL"])
+    return _hub
+
+
+@events_bp.get("/horror/events")
+def horror_events():
+    stream = stream_events(
+        get_hub(),
+        heartbeat_seconds=current_app.config["EVENTS_HEARTBEAT_SECONDS"]
+    )
+    response = Response(stream, mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    allow_origin = current_app.config.get("EVENTS_ALLOW_ORIGIN")
+    if allow_origin:
+        response.headers["Access-Control-Allow-Origin"] = allow_origin
+    return response
+
+
+@events_bp.get("/horror/events/health")
+def horror_events_health():
+    return {"ok": True, "subscribers": get_hub().subscriber_count()}
@@ -0,0 +1,36 @@
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from ..export import EXPORT_FORMATS, ExportParamsError, parse_date, stream_export
+
+export_bp = Blueprint("export", __name__)
+
+EXTENSIONS = {"csv": "csv", "parquet": "parquet", "arrow": "arrows"}
+
+
+def _export_response(kind):
+    fmt = request.args.get("format", "csv")
+    chunks = stream_export(
+        kind,
+        fmt,
+        start=parse_date(request.args.get("start"), "start"),
+        end=parse_date(request.args.get("end"), "end"),
+        genre=request.args.get("genre"),
+        chunk_size=request.args.get("chunk_size", 5000, type=int)
+    )
+    response = Response(stream_with_context(chunks), mimetype=EXPORT_FORMATS[fmt])
+    response.headers["Content-Disposition"] = f"attachment; filename={kind}.{EXTENSIONS[fmt]}"
+    return response
+
+
+@export_bp.get("/movies")
+def export_movies():
+    return _export_response("movies")
+
+
+@export_bp.get("/snapshots")
+def export_snapshots():
+    return _export_response("snapshots")
+
+
+@export_bp.errorhandler(ExportParamsError)
+def export_params_error(e):
+    return jsonify({"error": str(e)}), 400
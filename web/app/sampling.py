@@ -0,0 +1,90 @@
+import math
+from sqlalchemy import Integer, case, cast, func, literal
+from .db import db
+
+SAMPLE_MODES = ("stratified", "grid")
+
+
+def page_query(query, limit, cursor=None):
+    subq = query.subquery()
+    page = db.session.query(*subq.c)
+    if cursor is not None:
+        page = page.filter(subq.c.id > cursor)
+    return page.order_by(subq.c.id).limit(limit)
+
+
+def paginate(query, limit, cursor=None, decorate=None):
+    page = page_query(query, limit + 1, cursor)
+    rows = (decorate(page) if decorate else page).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = rows[-1].id
+
+    return rows, next_cursor
+
+
+def stratified_sample(query, budget, partition_by=None, decorate=None):
+    subq = query.subquery()
+    total = db.session.query(func.count()).select_from(subq).scalar()
+
+    if total <= budget:
+        sample = db.session.query(*subq.c).order_by(subq.c.id)
+    else:
+        # A single stride across every partition keeps each cluster's share of
+        # the sample proportional to its size while guaranteeing at least one point.
+        sample = stratified_query(query, math.ceil(total / budget), partition_by)
+    return (decorate(sample) if decorate else sample).all(), total
+
+
+def stratified_query(query, stride, partition_by=None):
+    subq = query.subquery()
+    partition = [subq.c[partition_by]] if partition_by else None
+    rn = func.row_number().over(partition_by=partition, order_by=subq.c.id).label("rn")
+    numbered = db.session.query(*subq.c, rn).subquery()
+
+    return db.session.query(*[c for c in numbered.c if c.name != "rn"])\
+        .filter((numbered.c.rn - 1) % stride == 0)\
+        .order_by(numbered.c.id)
+
+
+def _bin_index(value, low, width, side):
+    # floor() rather than CAST, which rounds on PostgreSQL; the maximum
+    # value lands exactly on the upper edge and is folded into the last bin.
+    index = cast(func.floor((value - low) / width), Integer)
+    return case((index > side - 1, side - 1), else_=index)
+
+
+def grid_bins(query, x_name, y_name, budget, group_by=None):
+    subq = query.subquery()
+    x, y = subq.c[x_name], subq.c[y_name]
+    groups = func.count(func.distinct(subq.c[group_by])) if group_by else literal(1)
+
+    min_x, max_x, min_y, max_y, total, n_groups = db.session.query(
+        func.min(x), func.max(x), func.min(y), func.max(y), func.count(), groups
+    ).select_from(subq).one()
+
+    if not total:
+        return [], 0
+
+    # Every group gets its own side x side grid, so the budget is split
+    # across groups to keep the total number of bins within it.
+    side = max(1, math.isqrt(budget // max(n_groups, 1)))
+    width_x = (max_x - min_x) / side or 1.0
+    width_y = (max_y - min_y) / side or 1.0
+    bin_x = _bin_index(x, min_x, width_x, side).label("bin_x")
+    bin_y = _bin_index(y, min_y, width_y, side).label("bin_y")
+
+    keys = [bin_x, bin_y]
+    columns = []
+    if group_by:
+        keys.insert(0, subq.c[group_by])
+        columns.append(subq.c[group_by])
+
+    rows = db.session.query(
+        *columns,
+        func.avg(x).label(x_name),
+        func.avg(y).label(y_name),
+        func.count().label("count")
+    ).group_by(*keys).all()
+    return rows, total
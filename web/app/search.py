@@ -0,0 +1,192 @@
+import logging
+import re
+from sqlalchemy import inspect, text
+from .db import db
+
+logger = logging.getLogger(__name__)
+
+# Adding a stored generated column rewrites the whole movies table under an
+# ACCESS EXCLUSIVE lock, so on a populated table it is only done by the
+# explicit migration (python -m app.migrate_search). Once added, it is
+# recomputed in the same statement as every INSERT/UPDATE issued by
+# upsert_movie, so the index can never go stale.
+POSTGRES_SEARCH_COLUMN = """
+    ALTER TABLE movies ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple'::regconfig, coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple'::regconfig, coalesce(original_title, '')), 'B') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(overview, '')), 'C')
+    ) STORED
+"""
+
+POSTGRES_SEARCH_INDEX = "CREATE INDEX {concurrently}IF NOT EXISTS ix_movies_search_vector ON movies USING gin (search_vector)"
+
+POSTGRES_TRGM_EXTENSION = "CREATE EXTENSION IF NOT EXISTS pg_trgm"
+POSTGRES_TRGM_INDEX = "CREATE INDEX {concurrently}IF NOT EXISTS ix_movies_title_trgm ON movies USING gin (title gin_trgm_ops)"
+
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts USING fts5(
+        title, original_title, overview,
+        content='movies', content_rowid='tmdb_id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS movies_fts_ai AFTER INSERT ON movies BEGIN
+        INSERT INTO movies_fts(rowid, title, original_title, overview)
+        VALUES (new.tmdb_id, new.title, new.original_title, new.overview);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS movies_fts_ad AFTER DELETE ON movies BEGIN
+        INSERT INTO movies_fts(movies_fts, rowid, title, original_title, overview)
+        VALUES ('delete', old.tmdb_id, old.title, old.original_title, old.overview);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS movies_fts_au AFTER UPDATE OF title, original_title, overview ON movies BEGIN
+        INSERT INTO movies_fts(movies_fts, rowid, title, original_title, overview)
+        VALUES ('delete', old.tmdb_id, old.title, old.original_title, old.overview);
+        INSERT INTO movies_fts(rowid, title, original_title, overview)
+        VALUES (new.tmdb_id, new.title, new.original_title, new.overview);
+    END
+    """,
+]
+
+# Broad terms can match a large share of the catalog, so only the
+# :candidates most popular matches (a deterministic set) are ranked. Full
+# searches keep that set fixed across pages, so rank order never shifts
+# between pages; results past it are not returned. Autocomplete orders by
+# popularity anyway, so its cap can grow with the offset without reordering.
+POSTGRES_SEARCH = """
+    WITH q AS (
+        SELECT {tsquery} AS query
+    ), candidates AS (
+        SELECT tmdb_id, title, original_title, release_date, popularity, search_vector
+        FROM movies, q
+        WHERE search_vector @@ q.query{fuzzy}
+        ORDER BY popularity DESC NULLS LAST, tmdb_id
+        LIMIT :candidates
+    )
+    SELECT tmdb_id, title, original_title, release_date, popularity,
+           ts_rank_cd(search_vector, q.query){similarity} AS rank
+    FROM candidates, q
+    ORDER BY {order}, tmdb_id
+    LIMIT :limit OFFSET :offset
+"""
+
+SQLITE_SEARCH = """
+    SELECT m.tmdb_id, m.title, m.original_title, m.release_date, m.popularity,
+           -bm25(movies_fts, 10.0, 5.0, 1.0) AS rank
+    FROM movies_fts JOIN movies AS m ON m.tmdb_id = movies_fts.rowid
+    WHERE movies_fts MATCH :match
+    ORDER BY {order}, m.tmdb_id
+    LIMIT :limit OFFSET :offset
+"""
+
+FALLBACK_SEARCH = """
+    SELECT tmdb_id, title, original_title, release_date, popularity, 0.0 AS rank
+    FROM movies
+    WHERE lower(title) LIKE :pattern OR lower(original_title) LIKE :pattern
+    ORDER BY popularity DESC, tmdb_id
+    LIMIT :limit OFFSET :offset
+"""
+
+
+_trigram_available = None
+
+
+def _ensure_postgres_search(conn):
+    columns = {c["name"] for c in inspect(conn).get_columns("movies")}
+    if "search_vector" in columns:
+        return True
+    if conn.execute(text("SELECT EXISTS (SELECT 1 FROM movies)")).scalar():
+        logger.warning("movies has no search_vector column; run python -m app.migrate_search")
+        return False
+
+    conn.execute(text(POSTGRES_SEARCH_COLUMN))
+    conn.execute(text(POSTGRES_SEARCH_INDEX.format(concurrently="")))
+    try:
+        with conn.begin_nested():
+            conn.execute(text(POSTGRES_TRGM_EXTENSION))
+            conn.execute(text(POSTGRES_TRGM_INDEX.format(concurrently="")))
+    except Exception as e:
+        logger.warning(f"pg_trgm unavailable, title search will not be typo tolerant: {e}")
+    return True
+
+
+def ensure_search_index(conn):
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        return _ensure_postgres_search(conn)
+    if dialect != "sqlite":
+        return False
+
+    exists = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'movies_fts'")
+    ).scalar()
+    statements = SQLITE_DDL if exists else SQLITE_DDL + ["INSERT INTO movies_fts(movies_fts) VALUES ('rebuild')"]
+    for statement in statements:
+        conn.execute(text(statement))
+    return True
+
+
+def trigram_available():
+    global _trigram_available
+    if _trigram_available is None:
+        _trigram_available = bool(db.session.execute(
+            text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        ).scalar())
+    return _trigram_available
+
+
+def tokenize(q):
+    return re.findall(r"\w+", q.lower())
+
+
+def _tsquery(tokens, title_only=False):
+    weight = "A" if title_only else ""
+    terms = [f"{t}:{weight}" if weight else t for t in tokens[:-1]]
+    terms.append(f"{tokens[-1]}:*{weight}")
+    return " & ".join(terms)
+
+
+def _fts5_match(tokens, title_only=False):
+    terms = [f'"{t}"' for t in tokens[:-1]] + [f'"{tokens[-1]}"*']
+    match = " ".join(terms)
+    return f"title : ({match})" if title_only else match
+
+
+def search_movies(q, limit=20, offset=0, autocomplete=False, candidates=1000):
+    tokens = tokenize(q)
+    if not tokens:
+        return []
+
+    dialect = db.session.get_bind().dialect.name
+    params = {"limit": limit, "offset": offset}
+
+    if dialect == "postgresql":
+        fuzzy = not autocomplete and trigram_available()
+        sql = POSTGRES_SEARCH.format(
+            tsquery="to_tsquery('simple', :tsquery)" if autocomplete
+            else "to_tsquery('simple', :tsquery) || to_tsquery('english', :tsquery)",
+            fuzzy=" OR title % :raw" if fuzzy else "",
+            similarity=" + similarity(title, :raw)" if fuzzy else "",
+            order="popularity DESC NULLS LAST, rank DESC" if autocomplete
+            else "rank DESC, popularity DESC NULLS LAST"
+        )
+        params.update(
+            tsquery=_tsquery(tokens, title_only=autocomplete),
+            raw=q.strip(),
+            candidates=max(candidates, offset + limit) if autocomplete else candidates
+        )
+    elif dialect == "sqlite":
+        order = "m.popularity DESC, rank DESC" if autocomplete else "rank DESC, m.popularity DESC"
+        sql = SQLITE_SEARCH.format(order=order)
+        params.update(match=_fts5_match(tokens, title_only=autocomplete))
+    else:
+        sql = FALLBACK_SEARCH
+        params.update(pattern=f"%{' '.join(tokens)}%")
+
+    return db.session.execute(text(sql), params).all()
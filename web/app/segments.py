@@ -0,0 +1,39 @@
+DEFAULT_SEGMENT = "horror"
+
+# Segment -> (genre name as stored in Movie.genres, TMDB genre id for /discover/movie).
+SEGMENTS = {
+    "action": ("Action", 28),
+    "adventure": ("Adventure", 12),
+    "animation": ("Animation", 16),
+    "comedy": ("Comedy", 35),
+    "crime": ("Crime", 80),
+    "documentary": ("Documentary", 99),
+    "drama": ("Drama", 18),
+    "family": ("Family", 10751),
+    "fantasy": ("Fantasy", 14),
+    "history": ("History", 36),
+    "horror": ("Horror", 27),
+    "music": ("Music", 10402),
+    "mystery": ("Mystery", 9648),
+    "romance": ("Romance", 10749),
+    "science-fiction": ("Science Fiction", 878),
+    "thriller": ("Thriller", 53),
+    "war": ("War", 10752),
+    "western": ("Western", 37),
+}
+
+
+def genre_name(segment):
+    return SEGMENTS[segment][0]
+
+
+def genre_id(segment):
+    return SEGMENTS[segment][1]
+
+
+def parse_segments(value):
+    segments = [s.strip() for s in value.split(",") if s.strip()]
+    unknown = [s for s in segments if s not in SEGMENTS]
+    if unknown:
+        raise ValueError(f"Unknown segments: {', '.join(unknown)} (known: {', '.join(SEGMENTS)})")
+    return segments or [DEFAULT_SEGMENT]
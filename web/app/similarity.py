@@ -0,0 +1,112 @@
+import io
+import json
+import threading
+import time
+from .db import db
+from .metrics import CACHE_REQUESTS, inc
+from .models import HorrorSimilarityIndex
+
+
+# numpy is only loaded once an index is built or read, keeping it out of the
+# web process start-up.
+def _to_bytes(array):
+    import numpy as np
+
+    buffer = io.BytesIO()
+    np.save(buffer, array, allow_pickle=False)
+    return buffer.getvalue()
+
+
+def _from_bytes(data):
+    import numpy as np
+
+    return np.load(io.BytesIO(data), allow_pickle=False)
+
+
+def build_similarity_row(segment, analysis_ts, tmdb_ids, titles, features, feature_names):
+    import numpy as np
+
+    return HorrorSimilarityIndex(
+        segment=segment,
+        analysis_ts=analysis_ts,
+        movie_count=len(tmdb_ids),
+        feature_names=json.dumps(list(feature_names)),
+        titles=json.dumps(list(titles)),
+        tmdb_ids=_to_bytes(np.asarray(tmdb_ids, dtype=np.int64)),
+        features=_to_bytes(np.asarray(features, dtype=np.float32))
+    )
+
+
+class SimilarityIndex:
+    def __init__(self, analysis_ts, tmdb_ids, titles, features, leaf_size=40):
+        from sklearn.neighbors import KDTree
+
+        self.analysis_ts = analysis_ts
+        self.tmdb_ids = tmdb_ids
+        self.titles = titles
+        self.positions = {int(t): i for i, t in enumerate(tmdb_ids)}
+        self.features = features
+        self.tree = KDTree(features, leaf_size=leaf_size)
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(
+            row.analysis_ts,
+            _from_bytes(row.tmdb_ids),
+            json.loads(row.titles),
+            _from_bytes(row.features)
+        )
+
+    def __len__(self):
+        return len(self.tmdb_ids)
+
+    def query(self, tmdb_id, k):
+        pos = self.positions.get(tmdb_id)
+        if pos is None:
+            return None
+
+        distances, indices = self.tree.query(self.features[pos:pos + 1], k=min(k + 1, len(self)))
+        return [
+            {
+                "tmdb_id": int(self.tmdb_ids[i]),
+                "title": self.titles[i],
+                "distance": float(d)
+            }
+            for d, i in zip(distances[0], indices[0]) if i != pos
+        ][:k]
+
+
+class SimilarityIndexCache:
+    def __init__(self, segment, recheck_seconds=30.0):
+        self.segment = segment
+        self.recheck_seconds = recheck_seconds
+        self._index = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self):
+        now = time.monotonic()
+        if self._index is not None and now - self._checked_at < self.recheck_seconds:
+            inc(CACHE_REQUESTS, ("similarity_index", "hit"))
+            return self._index
+
+        with self._lock:
+            if self._index is not None and now - self._checked_at < self.recheck_seconds:
+                inc(CACHE_REQUESTS, ("similarity_index", "hit"))
+                return self._index
+
+            latest_ts = db.session.query(db.func.max(HorrorSimilarityIndex.analysis_ts))\
+                .filter(HorrorSimilarityIndex.segment == self.segment)\
+                .scalar()
+            if latest_ts is None:
+                self._index = None
+            elif self._index is None or self._index.analysis_ts != latest_ts:
+                row = db.session.query(HorrorSimilarityIndex)\
+                    .filter(HorrorSimilarityIndex.segment == self.segment, HorrorSimilarityIndex.analysis_ts == latest_ts)\
+                    .first()
+                self._index = SimilarityIndex.from_row(row)
+                inc(CACHE_REQUESTS, ("similarity_index", "miss"))
+            else:
+                inc(CACHE_REQUESTS, ("similarity_index", "hit"))
+            self._checked_at = now
+            return self._index
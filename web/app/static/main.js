@@ -1,44 +1,76 @@
 let chartFeatureImportance, chartRealVsPredicted, chartConfusionMatrix, chartROC, chartPCA, chartClusterProfiles;
+let dashboardEtag = null;
+let renderedVersions = {};
 
-async function fetchFeatureImportance(){
-  const r = await fetch('/api/horror/regression/features');
+// Resolves to null when the server answers 304: nothing changed since the
+// last payload, so there is nothing to parse or draw.
+async function fetchDashboard(){
+  const headers = dashboardEtag ? { 'If-None-Match': dashboardEtag } : {};
+  const r = await fetch('/api/horror/dashboard', { cache: 'no-store', headers });
+  if (r.status === 304) return null;
+  if (!r.ok) throw new Error(`HTTP ${r.status}`);
   const j = await r.json();
+  dashboardEtag = r.headers.get('ETag');
   return j;
 }
 
-async function fetchRegressionPredictions(){
-  const r = await fetch('/api/horror/regression/predictions');
-  const j = await r.json();
-  return j.predictions || [];
+// Charts are created once; later renders copy the new datasets and options
+// into the existing chart and redraw it without animation.
+function syncChart(chart, canvasId, config){
+  if (!chart) return new Chart(document.getElementById(canvasId), config);
+  
+  const datasets = chart.data.datasets;
+  config.data.datasets.forEach((dataset, i) => {
+    if (datasets[i]) Object.assign(datasets[i], dataset);
+    else datasets.push(dataset);
+  });
+  datasets.length = config.data.datasets.length;
+  if (config.data.labels) chart.data.labels = config.data.labels;
+  chart.options = config.options;
+  chart.update('none');
+  return chart;
 }
 
-async function fetchClassification(){
-  const r = await fetch('/api/horror/classification');
-  const j = await r.json();
-  return j;
-}
+let percentileScratch = new Float64Array(0);
 
-async function fetchClusteringPCA(){
-  const r = await fetch('/api/horror/clustering/pca');
-  const j = await r.json();
-  return j.clusters || [];
+// Quickselect over a reused buffer: no per-render copy of the input and
+// O(n) instead of a full sort.
+function percentile(values, q){
+  const n = values.length;
+  if (percentileScratch.length < n) percentileScratch = new Float64Array(n);
+  const a = percentileScratch;
+  for (let i = 0; i < n; i++) a[i] = values[i];
+  
+  const k = Math.min(n - 1, Math.floor(n * q));
+  let lo = 0, hi = n - 1;
+  while (lo < hi) {
+    const pivot = a[(lo + hi) >> 1];
+    let i = lo, j = hi;
+    while (i <= j) {
+      while (a[i] < pivot) i++;
+      while (a[j] > pivot) j--;
+      if (i <= j) { const t = a[i]; a[i] = a[j]; a[j] = t; i++; j--; }
+    }
+    if (k <= j) hi = j;
+    else if (k >= i) lo = i;
+    else break;
+  }
+  return a[k];
 }
 
-async function fetchClusteringProfiles(){
-  const r = await fetch('/api/horror/clustering/profiles');
-  const j = await r.json();
-  return j.profiles || [];
+function maxOf(values){
+  let max = -Infinity;
+  for (let i = 0; i < values.length; i++) if (values[i] > max) max = values[i];
+  return max;
 }
 
 function renderFeatureImportanceChart(data){
-  if (!data.features || data.features.length === 0) return;
+  if (!data.columns || data.columns.name.length === 0) return;
   
-  const top10 = data.features.slice(0, 10);
-  const labels = top10.map(f => f.name);
-  const values = top10.map(f => f.importance);
+  const labels = data.columns.name.slice(0, 10);
+  const values = data.columns.importance.slice(0, 10);
   
-  if (chartFeatureImportance) chartFeatureImportance.destroy();
-  chartFeatureImportance = new Chart(document.getElementById('chartFeatureImportance'), {
+  chartFeatureImportance = syncChart(chartFeatureImportance, 'chartFeatureImportance', {
     type: 'bar',
     data: { 
       labels, 
@@ -70,24 +102,19 @@ function renderFeatureImportanceChart(data){
   document.getElementById('tblRegressionMetrics').innerHTML = metricsHtml;
 }
 
-function renderRealVsPredictedChart(predictions){
-  if (!predictions || predictions.length === 0) return;
-  
-  const actualValues = predictions.map(p => p.actual);
-  const predictedValues = predictions.map(p => p.predicted);
+function renderRealVsPredictedChart(data){
+  const predictions = data && data.columns;
+  if (!predictions || predictions.actual.length === 0) return;
   
-  const maxActual = Math.max(...actualValues);
-  const maxPredicted = Math.max(...predictedValues);
-  const maxValue = Math.max(maxActual, maxPredicted);
+  const actualValues = predictions.actual;
+  const predictedValues = predictions.predicted;
   
-  const p90Actual = actualValues.sort((a, b) => a - b)[Math.floor(actualValues.length * 0.9)];
-  const p90Predicted = predictedValues.sort((a, b) => a - b)[Math.floor(predictedValues.length * 0.9)];
-  const p90Max = Math.max(p90Actual, p90Predicted);
+  const maxValue = Math.max(maxOf(actualValues), maxOf(predictedValues));
+  const p90Max = Math.max(percentile(actualValues, 0.9), percentile(predictedValues, 0.9));
   
   const axisMax = maxValue > p90Max * 2 ? Math.ceil(p90Max * 1.4) : Math.ceil(maxValue * 1.2);
   
-  if (chartRealVsPredicted) chartRealVsPredicted.destroy();
-  chartRealVsPredicted = new Chart(document.getElementById('chartRealVsPredicted'), {
+  chartRealVsPredicted = syncChart(chartRealVsPredicted, 'chartRealVsPredicted', {
     type: 'scatter',
     data: {
       datasets: [
@@ -103,7 +130,7 @@ function renderRealVsPredictedChart(predictions){
         },
         {
           label: 'Filmes de Terror',
-          data: predictions.map(p => ({ x: p.actual, y: p.predicted })),
+          data: actualValues.map((actual, i) => ({ x: actual, y: predictedValues[i] })),
           backgroundColor: 'rgba(255, 99, 132, 0.6)',
           borderColor: 'rgba(255, 99, 132, 1)',
           pointRadius: 5
@@ -130,8 +157,9 @@ function renderRealVsPredictedChart(predictions){
           callbacks: {
             label: function(context) {
               if (context.dataset.label === 'Diagonal de Referência') return null;
-              const p = predictions[context.dataIndex];
-              return `${p.title}: (${p.actual.toFixed(1)}, ${p.predicted.toFixed(1)})`;
+              const i = context.dataIndex;
+              const name = predictions.title ? predictions.title[i] : `${predictions.count[i]} filmes`;
+              return `${name}: (${actualValues[i].toFixed(1)}, ${predictedValues[i].toFixed(1)})`;
             }
           }
         }
@@ -145,8 +173,7 @@ function renderConfusionMatrixChart(classification){
   
   const cm = classification.confusion_matrix;
   
-  if (chartConfusionMatrix) chartConfusionMatrix.destroy();
-  chartConfusionMatrix = new Chart(document.getElementById('chartConfusionMatrix'), {
+  chartConfusionMatrix = syncChart(chartConfusionMatrix, 'chartConfusionMatrix', {
     type: 'bar',
     data: {
       labels: ['TN (Baixa→Baixa)', 'FP (Baixa→Alta)', 'FN (Alta→Baixa)', 'TP (Alta→Alta)'],
@@ -180,8 +207,7 @@ function renderROCChart(classification){
   const rocData = fpr.map((f, i) => ({ x: f, y: tpr[i] }));
   const diagonalData = [{ x: 0, y: 0 }, { x: 1, y: 1 }];
   
-  if (chartROC) chartROC.destroy();
-  chartROC = new Chart(document.getElementById('chartROC'), {
+  chartROC = syncChart(chartROC, 'chartROC', {
     type: 'line',
     data: {
       datasets: [
@@ -238,10 +264,11 @@ function renderROCChart(classification){
   document.getElementById('tblClassificationMetrics').innerHTML = metricsHtml;
 }
 
-function renderPCAChart(clusters){
-  if (!clusters || clusters.length === 0) return;
+function renderPCAChart(data){
+  const clusters = data && data.columns;
+  if (!clusters || clusters.cluster_id.length === 0) return;
   
-  const uniqueClusters = [...new Set(clusters.map(c => c.cluster_id))];
+  const uniqueClusters = [...new Set(clusters.cluster_id)];
   const colors = [
     'rgba(255, 99, 132, 0.7)',
     'rgba(54, 162, 235, 0.7)',
@@ -251,19 +278,22 @@ function renderPCAChart(clusters){
     'rgba(255, 206, 86, 0.7)'
   ];
   
+  const pointsByCluster = new Map(uniqueClusters.map(clusterId => [clusterId, []]));
+  clusters.cluster_id.forEach((clusterId, i) => {
+    pointsByCluster.get(clusterId).push({ x: clusters.pca_x[i], y: clusters.pca_y[i] });
+  });
+  
   const datasets = uniqueClusters.map(clusterId => {
-    const clusterData = clusters.filter(c => c.cluster_id === clusterId);
     return {
       label: `Cluster ${clusterId}`,
-      data: clusterData.map(c => ({ x: c.pca_x, y: c.pca_y })),
+      data: pointsByCluster.get(clusterId),
       backgroundColor: colors[clusterId % colors.length],
       borderColor: colors[clusterId % colors.length].replace('0.7', '1'),
       pointRadius: 6
     };
   });
   
-  if (chartPCA) chartPCA.destroy();
-  chartPCA = new Chart(document.getElementById('chartPCA'), {
+  chartPCA = syncChart(chartPCA, 'chartPCA', {
     type: 'scatter',
     data: { datasets },
     options: {
@@ -278,31 +308,30 @@ function renderPCAChart(clusters){
 }
 
 function renderClusterProfilesChart(profiles){
-  if (!profiles || profiles.length === 0) return;
+  if (!profiles || !profiles.cluster_id || profiles.cluster_id.length === 0) return;
   
-  const labels = profiles.map(p => `Cluster ${p.cluster_id} (${p.movie_count} filmes)`);
+  const labels = profiles.cluster_id.map((clusterId, i) => `Cluster ${clusterId} (${profiles.movie_count[i]} filmes)`);
   
-  if (chartClusterProfiles) chartClusterProfiles.destroy();
-  chartClusterProfiles = new Chart(document.getElementById('chartClusterProfiles'), {
+  chartClusterProfiles = syncChart(chartClusterProfiles, 'chartClusterProfiles', {
     type: 'bar',
     data: {
       labels,
       datasets: [
         {
           label: 'Popularidade Média',
-          data: profiles.map(p => p.avg_popularity),
+          data: profiles.avg_popularity,
           backgroundColor: 'rgba(255, 99, 132, 0.7)',
           yAxisID: 'y'
         },
         {
           label: 'Avaliação Média',
-          data: profiles.map(p => p.avg_vote_average),
+          data: profiles.avg_vote_average,
           backgroundColor: 'rgba(54, 162, 235, 0.7)',
           yAxisID: 'y1'
         },
         {
           label: 'Duração Média (min)',
-          data: profiles.map(p => p.avg_runtime),
+          data: profiles.avg_runtime,
           backgroundColor: 'rgba(75, 192, 192, 0.7)',
           yAxisID: 'y2'
         }
@@ -343,35 +372,44 @@ function renderClusterProfilesChart(profiles){
   });
 }
 
+const sectionRenderers = {
+  features: d => renderFeatureImportanceChart(d.features),
+  predictions: d => renderRealVsPredictedChart(d.predictions),
+  classification: d => { renderConfusionMatrixChart(d.classification); renderROCChart(d.classification); },
+  clusters: d => renderPCAChart(d.clusters),
+  profiles: d => renderClusterProfilesChart(d.profiles)
+};
+
 async function refresh(){
   try {
-    const [features, predictions, classification, clustersPCA, profiles] = await Promise.all([
-      fetchFeatureImportance(),
-      fetchRegressionPredictions(),
-      fetchClassification(),
-      fetchClusteringPCA(),
-      fetchClusteringProfiles()
-    ]);
+    const dashboard = await fetchDashboard();
+    if (!dashboard) return;
     
-    console.log('Features:', features);
-    console.log('Predictions:', predictions);
-    console.log('Classification:', classification);
-    console.log('Clusters PCA:', clustersPCA);
-    console.log('Profiles:', profiles);
-    
-    renderFeatureImportanceChart(features);
-    renderRealVsPredictedChart(predictions);
-    renderConfusionMatrixChart(classification);
-    renderROCChart(classification);
-    renderPCAChart(clustersPCA);
-    renderClusterProfilesChart(profiles);
+    // Only sections whose analysis changed since the last render are redrawn.
+    const versions = dashboard.versions || {};
+    for (const [section, render] of Object.entries(sectionRenderers)) {
+      if (versions[section] !== undefined && versions[section] === renderedVersions[section]) continue;
+      render(dashboard);
+    }
+    renderedVersions = versions;
   } catch (error) {
     console.error('Erro ao atualizar dashboard:', error);
   }
 }
 
+function subscribeToAnalysisEvents(){
+  const status = document.getElementById('liveStatus');
+  const source = new EventSource(status.dataset.eventsUrl);
+  
+  source.addEventListener('analysis', () => refresh());
+  // Events published while the stream (or the server's Redis listener) was
+  // reconnecting are lost, so catch up on every open and, as a slow
+  // fallback, on a timer. Unchanged data costs a 304.
+  source.addEventListener('open', () => refresh());
+  setInterval(refresh, Number(status.dataset.fallbackRefreshMs) || 300000);
+}
+
 window.addEventListener('load', async () => {
   await refresh();
-  const pollMs = parseInt(document.querySelector('small').innerText.match(/\d+/)[0]) * 1000;
-  setInterval(refresh, pollMs);
-});
\ No newline at end of file
+  subscribeToAnalysisEvents();
+});
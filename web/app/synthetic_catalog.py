@@ -0,0 +1,100 @@
+import argparse
+import math
+import random
+from datetime import date, datetime, timedelta
+from sqlalchemy import insert
+from .db import db
+from .models import Movie
+
+# Rough shares of TMDB's catalog; a movie draws its genres independently, so
+# multi-genre combinations (Horror + Thriller, ...) appear at natural rates.
+GENRE_WEIGHTS = {
+    "Drama": 0.36, "Comedy": 0.24, "Thriller": 0.14, "Action": 0.13, "Romance": 0.11,
+    "Horror": 0.10, "Crime": 0.09, "Documentary": 0.08, "Adventure": 0.07, "Animation": 0.06,
+    "Family": 0.06, "Mystery": 0.05, "Science Fiction": 0.05, "Fantasy": 0.05, "Music": 0.03,
+    "History": 0.03, "War": 0.02, "Western": 0.01,
+}
+# Horror skews towards these co-genres on TMDB.
+HORROR_COGENRES = {"Thriller": 0.45, "Mystery": 0.20, "Science Fiction": 0.12, "Fantasy": 0.10}
+LANGUAGE_WEIGHTS = {
+    "en": 0.55, "fr": 0.07, "es": 0.07, "ja": 0.06, "de": 0.04, "it": 0.04,
+    "ko": 0.03, "hi": 0.03, "pt": 0.03, "zh": 0.03, "ru": 0.03, "sv": 0.02,
+}
+FIRST_YEAR = 1950
+WORDS = ["night", "house", "dark", "blood", "silent", "hollow", "last", "curse", "shadow", "return",
+         "lake", "doll", "summer", "city", "love", "war", "road", "girl", "king", "secret"]
+
+
+def _release_date(rng, last_year):
+    # Output grows roughly exponentially, so recent years dominate.
+    span = last_year - FIRST_YEAR + 1
+    year = last_year - min(span - 1, int(rng.expovariate(1 / 12)))
+    return date(year, 1, 1) + timedelta(days=rng.randrange(365))
+
+
+def _genres(rng):
+    genres = [g for g, w in GENRE_WEIGHTS.items() if rng.random() < w]
+    if "Horror" in genres:
+        genres += [g for g, w in HORROR_COGENRES.items() if g not in genres and rng.random() < w]
+    return genres or ["Drama"]
+
+
+def generate_movies(n, seed=42, first_id=1, now=None):
+    rng = random.Random(seed)
+    now = now or datetime.utcnow()
+    languages, language_weights = zip(*LANGUAGE_WEIGHTS.items())
+    for tmdb_id in range(first_id, first_id + n):
+        vote_count = int(rng.paretovariate(1.1) * 5) - 5
+        title = " ".join(rng.choice(WORDS).capitalize() for _ in range(rng.randint(1, 4)))
+        yield {
+            "tmdb_id": tmdb_id,
+            "imdb_id": f"tt{tmdb_id:08d}",
+            "title": title,
+            "original_title": title,
+            "overview": " ".join(rng.choice(WORDS) for _ in range(rng.randint(15, 60))),
+            "language": rng.choices(languages, language_weights)[0],
+            "release_date": None if rng.random() < 0.02 else _release_date(rng, now.year),
+            "popularity": round(rng.lognormvariate(0.5, 1.2) * (1 + math.log1p(vote_count)), 3),
+            "vote_count": vote_count,
+            # Few votes means a noisy average, as on TMDB.
+            "vote_average": round(min(10.0, max(0.0, rng.gauss(6.2, 0.8 + 3.0 / math.sqrt(vote_count + 1)))), 1),
+            "runtime": None if rng.random() < 0.03 else max(0, int(rng.gauss(100, 22))),
+            "genres": ",".join(_genres(rng)),
+            "inserted_at": now,
+            "updated_at": now - timedelta(minutes=rng.randrange(60 * 24 * 30)),
+        }
+
+
+def load_catalog(n, seed=42, chunk_size=10_000):
+    batch = []
+    for row in generate_movies(n, seed):
+        batch.append(row)
+        if len(batch) >= chunk_size:
+            db.session.execute(insert(Movie), batch)
+            batch = []
+    if batch:
+        db.session.execute(insert(Movie), batch)
+    db.session.commit()
+    return n
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill a throwaway database with a synthetic movie catalog.")
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--rows", type=int, default=10_000, help="e.g. 1000, 10000, 100000, 1000000")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate all tables first")
+    args = parser.parse_args()
+
+    from . import create_app
+    app = create_app(SQLALCHEMY_DATABASE_URI=args.database_url, SQLALCHEMY_BINDS={})
+    with app.app_context():
+        if args.reset:
+            db.drop_all()
+        db.create_all()
+        load_catalog(args.rows, args.seed)
+    print(f"✅ {args.rows} filmes sintéticos gerados")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import functools
+import inspect
+import json
+import logging
+import threading
+import time
+import uuid
+from .config import Config
+from .events import redis_client
+
+logger = logging.getLogger(__name__)
+
+LOCK_PREFIX = "tmdb:lock:"
+PENDING_PREFIX = "tmdb:pending:"
+STATS_PREFIX = "tmdb:task_stats:"
+
+RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class LeaseLock:
+    def __init__(self, client, name, lease_seconds=120.0):
+        self.client = client
+        self.key = LOCK_PREFIX + name
+        self.lease_ms = int(lease_seconds * 1000)
+        self.token = uuid.uuid4().hex
+        self.lost = False
+        self._stop = threading.Event()
+        self._renewer = None
+
+    def acquire(self, wait_seconds=0.0, poll_seconds=0.5):
+        deadline = time.monotonic() + wait_seconds
+        while True:
+            if self.client.set(self.key, self.token, nx=True, px=self.lease_ms):
+                self._renewer = threading.Thread(target=self._renew, name=f"lease-{self.key}", daemon=True)
+                self._renewer.start()
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(min(poll_seconds, max(0.0, deadline - time.monotonic())))
+
+    def _renew(self):
+        while not self._stop.wait(self.lease_ms / 3000.0):
+            try:
+                if not self.client.eval(RENEW_SCRIPT, 1, self.key, self.token, self.lease_ms):
+                    self.lost = True
+                    logger.warning(f"Lost lease on {self.key}; another run may start concurrently")
+                    return
+            except Exception as e:
+                logger.warning(f"Failed to renew lease on {self.key}: {e}")
+
+    def release(self):
+        self._stop.set()
+        if self._renewer is not None:
+            self._renewer.join()
+        try:
+            self.client.eval(RELEASE_SCRIPT, 1, self.key, self.token)
+        except Exception as e:
+            logger.warning(f"Failed to release {self.key}, it will expire with its lease: {e}")
+
+
+def record_stats(client, name, **fields):
+    key = STATS_PREFIX + name
+    pipe = client.pipeline()
+    for field, value in fields.items():
+        if isinstance(value, float):
+            pipe.hincrbyfloat(key, field, value)
+        else:
+            pipe.hincrby(key, field, value)
+    pipe.execute()
+
+
+def get_stats(client, name):
+    raw = client.hgetall(STATS_PREFIX + name)
+    return {k.decode(): float(v) for k, v in raw.items()}
+
+
+def _pop_pending(client, name):
+    pipe = client.pipeline()
+    pipe.get(PENDING_PREFIX + name)
+    pipe.delete(PENDING_PREFIX + name)
+    pending, _ = pipe.execute()
+    return json.loads(pending) if pending else None
+
+
+# A call that finds the lock taken is skipped. With coalesce, its kwargs are
+# stored as the single pending run, and the lock holder re-dispatches that run
+# when it finishes, so any number of duplicates collapse into one follow-up.
+def singleton_task(task_name, lease_seconds=120.0, wait_seconds=0.0, coalesce=True, pending_ttl=24 * 3600):
+    name = task_name.rsplit(".", 1)[-1]
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            from .celery_app import celery
+
+            call_kwargs = dict(inspect.signature(fn).bind_partial(*args, **kwargs).arguments)
+            client = redis_client(Config.REDIS_URL)
+            lock = LeaseLock(client, name, lease_seconds)
+
+            start = time.monotonic()
+            acquired = lock.acquire(wait_seconds)
+            waited = time.monotonic() - start
+
+            if not acquired:
+                coalesced = False
+                if coalesce:
+                    previous = client.set(PENDING_PREFIX + name, json.dumps(call_kwargs), ex=pending_ttl, get=True)
+                    coalesced = previous is not None
+                record_stats(client, name, skipped=1, coalesced=int(coalesced), lock_wait_seconds=waited)
+                logger.info(f"Skipping {name}: another run holds the lock")
+                return {"skipped": True, "reason": "already running", "pending": coalesce}
+
+            record_stats(client, name, acquired=1, lock_wait_seconds=waited)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                lock.release()
+                # Checked after releasing so a duplicate arriving in between is
+                # never lost, at worst it runs once more.
+                pending = _pop_pending(client, name) if coalesce else None
+                if pending is not None:
+                    celery.send_task(task_name, kwargs=pending)
+                    record_stats(client, name, redispatched=1)
+
+        return wrapper
+    return decorator
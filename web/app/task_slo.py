@@ -0,0 +1,95 @@
+import argparse
+import json
+import time
+from .config import Config
+from .events import redis_client
+
+LATENCY_PREFIX = "tmdb:task_latency:"
+LATENCY_SAMPLES = 1000
+ENQUEUED_HEADER = "enqueued_at"
+
+TASKS = ["task_update_movies", "task_train", "task_ingest", "task_initial_ingest"]
+
+
+def record_latency(client, name, queue_wait, total):
+    sample = json.dumps({"ts": time.time(), "queue_wait": queue_wait, "total": total})
+    pipe = client.pipeline()
+    pipe.lpush(LATENCY_PREFIX + name, sample)
+    pipe.ltrim(LATENCY_PREFIX + name, 0, LATENCY_SAMPLES - 1)
+    pipe.execute()
+
+
+def latency_samples(client, name, since=None):
+    samples = [json.loads(s) for s in client.lrange(LATENCY_PREFIX + name, 0, -1)]
+    if since is not None:
+        samples = [s for s in samples if s["ts"] >= since]
+    return samples
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100.0 * len(ordered)))]
+
+
+def summarize(samples, slo_seconds=None):
+    totals = [s["total"] for s in samples]
+    waits = [s["queue_wait"] for s in samples]
+    summary = {
+        "runs": len(samples),
+        "queue_wait_p50": percentile(waits, 50),
+        "queue_wait_p99": percentile(waits, 99),
+        "total_p50": percentile(totals, 50),
+        "total_p99": percentile(totals, 99),
+        "total_max": max(totals) if totals else None,
+    }
+    if slo_seconds is not None and totals:
+        summary["slo_seconds"] = slo_seconds
+        summary["slo_met_ratio"] = sum(t <= slo_seconds for t in totals) / len(totals)
+    return summary
+
+
+def _fmt(value):
+    return "-" if value is None else f"{value:.1f}s"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Report queue wait and enqueue-to-finish latency per task, and the update-to-snapshot SLO."
+    )
+    parser.add_argument("--hours", type=float, default=24.0, help="Only samples from the last N hours")
+    parser.add_argument("--slo-seconds", type=float, default=Config.UPDATE_SNAPSHOT_SLO_SECONDS)
+    parser.add_argument("--slo-target", type=float, default=0.99, help="Required share of updates within the SLO")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    client = redis_client(Config.REDIS_URL)
+    since = time.time() - args.hours * 3600
+    report = {
+        name: summarize(latency_samples(client, name, since), args.slo_seconds if name == "task_update_movies" else None)
+        for name in TASKS
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for name, s in report.items():
+            print(
+                f"{name:22} runs={s['runs']:<5} fila p50={_fmt(s['queue_wait_p50'])} p99={_fmt(s['queue_wait_p99'])}"
+                f"  total p50={_fmt(s['total_p50'])} p99={_fmt(s['total_p99'])} max={_fmt(s['total_max'])}"
+            )
+
+    update = report["task_update_movies"]
+    if not update["runs"]:
+        print("⚠️ Nenhuma execução de task_update_movies registrada no período")
+        return
+    ratio = update["slo_met_ratio"]
+    status = "✅" if ratio >= args.slo_target else "❌"
+    print(f"{status} update→snapshot em até {args.slo_seconds:.0f}s: {ratio:.1%} das execuções (meta {args.slo_target:.0%})")
+    if ratio < args.slo_target:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
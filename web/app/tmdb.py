@@ -5,24 +5,36 @@ import logging
 from datetime import datetime, timezone
 from flask import current_app
 from .db import db
+from .metrics import TMDB_REQUEST_SECONDS, observe
 from .models import Movie, Snapshot
+from .segments import DEFAULT_SEGMENT, genre_id, genre_name
 
 logger = logging.getLogger(__name__)
 
 BASE = "https://api.themoviedb.org/3"
 
 
+def endpoint_label(path):
+    return "/movie/{id}" if path.startswith("/movie/") and path[len("/movie/"):].isdigit() else path
+
+
 def tmdb_get(path, params=None):
     params = params or {}
     api_key = current_app.config["TMDB_API_KEY"]
-    url = f"{BASE}{path}"
+    url = f"{current_app.config.get('TMDB_BASE_URL') or BASE}{path}"
     
-    if api_key.startswith("eyJ"):
-        headers = {"Authorization": f"Bearer {api_key}"}
-        r = requests.get(url, params=params, headers=headers, timeout=10)
-    else:
-        params["api_key"] = api_key
-        r = requests.get(url, params=params, timeout=10)
+    start = time.perf_counter()
+    status = "error"
+    try:
+        if api_key.startswith("eyJ"):
+            headers = {"Authorization": f"Bearer {api_key}"}
+            r = requests.get(url, params=params, headers=headers, timeout=10)
+        else:
+            params["api_key"] = api_key
+            r = requests.get(url, params=params, timeout=10)
+        status = r.status_code
+    finally:
+        observe(TMDB_REQUEST_SECONDS, (endpoint_label(path), status), time.perf_counter() - start)
     
     r.raise_for_status()
     return r.json()
@@ -199,7 +211,8 @@ def _discover_movies_for_year_with_genre(year, genre_id, min_votes, max_pages, s
     return movies_count
 
 
-def collect_movies_by_year_range(start_year=2025, end_year=None, max_pages_per_year=20, sleep_per_call=0.1):
+def collect_movies_by_year_range(start_year=2025, end_year=None, max_pages_per_year=20, sleep_per_call=0.1,
+                                 segment=DEFAULT_SEGMENT):
     if end_year is None:
         end_year = datetime.now().year
     
@@ -207,12 +220,12 @@ def collect_movies_by_year_range(start_year=2025, end_year=None, max_pages_per_y
     snapshot_ts = datetime.now(timezone.utc)
     total_movies = 0
     
-    logger.info(f"Collecting horror movies: {start_year}-{end_year}")
+    logger.info(f"Collecting {segment} movies: {start_year}-{end_year}")
     
     for year in range(start_year, end_year + 1):
-        year_movies = _discover_movies_for_year_with_genre(year, 27, 10, max_pages_per_year, snapshot_ts, sleep_per_call)
+        year_movies = _discover_movies_for_year_with_genre(year, genre_id(segment), 10, max_pages_per_year, snapshot_ts, sleep_per_call)
         total_movies += year_movies
-        logger.info(f"Year {year}: {year_movies} horror movies (total: {total_movies})")
+        logger.info(f"Year {year}: {year_movies} {segment} movies (total: {total_movies})")
     
     duration = time.time() - start_time
     logger.info(f"Collection completed: {total_movies} movies in {duration/60:.1f}m")
@@ -223,7 +236,7 @@ def collect_movies_by_year_range(start_year=2025, end_year=None, max_pages_per_y
         "years_processed": end_year - start_year + 1,
         "start_year": start_year,
         "end_year": end_year,
-        "genre": "Horror",
+        "genre": genre_name(segment),
         "duration_minutes": round(duration / 60, 2),
         "ts": snapshot_ts.isoformat()
     }
@@ -275,8 +288,12 @@ def _update_recent_years(years, existing_ids, min_votes, max_pages, snapshot_ts,
     return new_count, updated_count
 
 
+def oldest_movies_query(limit):
+    return db.session.query(Movie).order_by(Movie.updated_at.asc()).limit(limit)
+
+
 def _update_oldest_movies(limit, snapshot_ts, sleep_per_call):
-    movies = db.session.query(Movie).order_by(Movie.updated_at.asc()).limit(limit).all()
+    movies = oldest_movies_query(limit).all()
     updated = 0
     
     for movie in movies: